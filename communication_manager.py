@@ -1,77 +1,625 @@
 """
 Communication Manager - Verbesserte Version mit korrektem LIMA-Protokoll
 """
+import dataclasses
+import errno
+import os
+import select
 import socket
+import selectors
 import threading
 import time
 import logging
-from typing import Optional, Dict, Any, Callable, Tuple, List
+import queue
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Deque, Tuple, List, Mapping, Union
 import json
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 from exceptions import CommunicationError, ValidationError
 from validation import Validator
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+try:  # pragma: no cover - optionale Abhängigkeit
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - ImportError oder ähnliches
+    orjson = None  # type: ignore
+
+try:  # pragma: no cover - optionale Abhängigkeit
+    import simdjson  # type: ignore
+except Exception:  # pragma: no cover - ImportError oder ähnliches
+    simdjson = None  # type: ignore
+
+# Unterhalb dieser Größe lohnt sich der SIMD-Parser nicht (Startkosten)
+SIMDJSON_MIN_SIZE = 1024
+
+# simdjson.Parser ist nicht thread-sicher -> ein Parser pro Thread
+_simdjson_local = threading.local()
+
+
+def _json_loads(data: Any) -> Any:
+    """Parst JSON mit orjson (falls installiert), sonst mit der Standardbibliothek."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback-Serialisierung für numpy-Arrays und Dataclasses (stdlib json)."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Typ {type(obj).__name__} ist nicht JSON-serialisierbar")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialisiert nach JSON-Bytes mit orjson (falls installiert).
+
+    numpy-Arrays (z.B. ``np.asarray(points, dtype=np.float32)``) und
+    Dataclasses werden direkt unterstützt.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+        )
+    # Kompakte Trenner wie bei orjson (ohne Leerzeichen)
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads_lazy(data: str, materialize: bool = False) -> Any:
+    """Parst JSON bei großen Payloads lazy mit simdjson.
+
+    Das zurückgegebene simdjson-Proxy-Objekt wird beim nächsten Parse im selben
+    Thread ungültig. Mit ``materialize=True`` wird stattdessen ein
+    eigenständiges dict/list geliefert.
+    """
+    raw = data.encode("utf-8")
+    if simdjson is None or len(raw) < SIMDJSON_MIN_SIZE:
+        return _json_loads(raw)
+
+    parser = getattr(_simdjson_local, "parser", None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+
+    doc = parser.parse(raw)
+    if materialize:
+        if isinstance(doc, simdjson.Object):
+            return doc.as_dict()
+        if isinstance(doc, simdjson.Array):
+            return doc.as_list()
+    return doc
+
+
+def is_json_object(value: Any) -> bool:
+    """True für ein JSON-Objekt (dict oder lazy simdjson.Object)"""
+    if isinstance(value, dict):
+        return True
+    return simdjson is not None and isinstance(value, simdjson.Object)
+
+
+# Maximale Anzahl gleichzeitig wartender Aufträge, die gebündelt gesendet werden
+_IO_BATCH_LIMIT = 16
+
+# Ein XML-Tag; Attributwerte in Anführungszeichen dürfen ">" enthalten
+_XML_TAG_RE = re.compile(rb"""<(?:[^>"']|"[^"]*"|'[^']*')*>""")
+
+
+def _configure_socket(sock: socket.socket) -> None:
+    """Setzt Low-Latency-Optionen für Request/Response-Verbindungen
+
+    Nagle deaktivieren, Keepalive aktivieren, Puffergrößen setzen und unter
+    Linux zusätzlich TCP_QUICKACK.
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, Config.SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, Config.SOCKET_BUFFER_SIZE)
+    if hasattr(socket, "TCP_QUICKACK"):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError:
+            pass
+
+
+def _encode_command(command: Union[str, bytes]) -> bytes:
+    """Kodiert ein LIMA-Kommando inkl. abschließendem Newline"""
+    if isinstance(command, bytes):
+        return command if command.endswith(b"\n") else command + b"\n"
+    return command.encode("utf-8") + b"\n"
+
+
+def _command_label(commands: List[Union[str, bytes]]) -> str:
+    """Lesbare Darstellung der Kommandos für Log- und Fehlermeldungen"""
+    labels = [
+        c.decode("utf-8", errors="replace").rstrip("\n") if isinstance(c, bytes) else c
+        for c in commands
+    ]
+    return "; ".join(labels)
+
+
+# Maximale Anzahl Log-Events, die pro Weckruf an log_callback gehen
+_LOG_BATCH_LIMIT = 64
+
+# Zuletzt formatierte Sekunde für _event_timestamp: (Sekunde, "HH:MM:SS")
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _event_timestamp() -> str:
+    """Zeitstempel "HH:MM:SS.mmm" für Listener-Events
+
+    Ohne datetime-Objekt; strftime läuft nur einmal pro Sekunde.
+    """
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if cached_second != second:
+        prefix = time.strftime("%H:%M:%S", time.localtime(second))
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}"
+
+
+# Nachrichtenende im Listener (siehe ListenerMode._split_messages)
+_MESSAGE_TERMINATORS = (b"END", b"\n", b"\r")
+
+# Einzelnes LIMA-Element ohne Kindelemente, Entities oder Zeilenumbrüche in
+# Attributwerten; alles andere wird an ElementTree übergeben. Die Muster
+# arbeiten direkt auf den empfangenen Bytes.
+_LIMA_ELEMENT_RE = re.compile(
+    rb"""\A\s*<([A-Za-z_][\w.-]*)((?:\s+[A-Za-z_][\w.-]*\s*=\s*(?:"[^"<&\t\n\r]*"|'[^'<&\t\n\r]*'))*)\s*(?:/>|>([^<&\r]*)</\1\s*>)\s*\Z"""
+)
+_LIMA_ATTR_RE = re.compile(rb"""([A-Za-z_][\w.-]*)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+
+def _parse_lima_element(response: Union[str, bytes]) -> Optional[Dict[str, str]]:
+    """Schnellpfad für parse_lima_response ohne Aufbau eines ElementTrees
+
+    Dekodiert werden nur Attributwerte und Text, nicht die ganze Antwort.
+    Liefert None, wenn die Antwort nicht dem einfachen Format entspricht.
+    """
+    if isinstance(response, str):
+        response = response.encode("utf-8")
+
+    match = _LIMA_ELEMENT_RE.match(response)
+    if match is None:
+        return None
+
+    attributes: Dict[str, str] = {}
+    try:
+        for attr in _LIMA_ATTR_RE.finditer(response, match.start(2), match.end(2)):
+            name = attr.group(1).decode("ascii")
+            if name in attributes:
+                return None  # doppeltes Attribut -> ElementTree meldet den Fehler
+            value = attr.group(2) if attr.group(2) is not None else attr.group(3)
+            attributes[name] = value.decode("utf-8")
+
+        text = match.group(3)
+        if text:
+            attributes['TEXT'] = text.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return None
+    return attributes
+
+
+# Rückgabewerte von connect_ex für einen laufenden nicht-blockierenden Connect
+_CONNECT_PENDING = frozenset(
+    {0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+)
+
+# Nur in den Empfangspuffer schauen, ohne zu blockieren (MSG_DONTWAIT nicht unter Windows)
+_PEEK_FLAGS = socket.MSG_PEEK | getattr(socket, "MSG_DONTWAIT", 0)
+
+
+@lru_cache(maxsize=32)
+def _resolve(host: str, port: int, socktype: int = socket.SOCK_STREAM) -> Tuple:
+    """Löst Host/Port einmalig auf und liefert (family, type, proto, sockaddr)
+
+    Folgeverbindungen zum selben Ziel sparen sich damit den Resolver-Aufruf.
+    """
+    family, socktype, proto, _, sockaddr = socket.getaddrinfo(
+        host, port, socket.AF_INET, socktype
+    )[0]
+    return family, socktype, proto, sockaddr
+
+
+def open_connection(host: str, port: int, timeout: float) -> socket.socket:
+    """Baut eine konfigurierte TCP-Verbindung über die gecachte Adresse auf"""
+    family, socktype, proto, sockaddr = _resolve(host, port)
+    sock = socket.socket(family, socktype, proto)
+    try:
+        _configure_socket(sock)
+        sock.settimeout(timeout)
+        sock.connect(sockaddr)
+    except OSError:
+        sock.close()
+        # Adresse könnte veraltet sein -> beim nächsten Versuch neu auflösen
+        _resolve.cache_clear()
+        raise
+    return sock
+
 
 class LimaClient:
-    """Client für LIMA-Kommunikation mit korrektem XML-Protokoll"""
+    """Client für LIMA-Kommunikation mit korrektem XML-Protokoll
+
+    Die TCP-Verbindung wird beim ersten Kommando aufgebaut und für alle
+    weiteren Kommandos wiederverwendet. Sie gehört exklusiv einem I/O-Thread,
+    der Aufträge aus einer Queue abarbeitet und gleichzeitig anstehende
+    Aufträge in einem Schreibvorgang bündelt.
+    """
     
-    def __init__(self, host: str, port: int, timeout: float = 5.0):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = 5.0,
+        udp_port: Optional[int] = None,
+    ):
         self.host = host
         self.port = port
         self.timeout = timeout
-        self.logger = logging.getLogger(__name__)
+        # Optionaler UDP-Port für idempotente Abfragen (None = nur TCP)
+        self.udp_port = udp_port
+
+        # Persistente Verbindung (lazy aufgebaut, nur im I/O-Thread benutzt)
+        self._sock: Optional[socket.socket] = None
+        self._queue: "queue.SimpleQueue[Optional[Tuple[List[str], Future]]]" = queue.SimpleQueue()
+        self._io_thread: Optional[threading.Thread] = None
+        self._io_start_lock = threading.Lock()
+
+        # Wiederverwendeter Empfangspuffer (nur im I/O-Thread benutzen)
+        self._rxbuf = bytearray(16384)
+        self._rxview = memoryview(self._rxbuf)
+        # Empfangene, noch nicht abgeholte Daten (überzählige Antworten)
+        self._pending = bytearray()
     
     def test_connection(self) -> bool:
-        """Testet die Verbindung zu LIMA"""
+        """Testet die Verbindung zu LIMA
+
+        Bei bestehender persistenter Verbindung genügt ein nicht-blockierender
+        Blick in den Empfangspuffer (b"" = Gegenstelle hat geschlossen); sonst
+        wird ein nicht-blockierender Verbindungsaufbau geprüft.
+        """
+        sock = self._sock
+        if sock is not None:
+            try:
+                readable, _, _ = select.select([sock], [], [], 0)
+                if not readable or sock.recv(1, _PEEK_FLAGS):
+                    return True
+            except (OSError, ValueError):
+                pass  # Verbindung inzwischen geschlossen -> neu prüfen
+
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                result = sock.connect_ex((self.host, self.port))
-                return result == 0
+            family, socktype, proto, sockaddr = _resolve(self.host, self.port)
+            with socket.socket(family, socktype, proto) as sock:
+                # Nicht-blockierender Connect, Ergebnis über SO_ERROR prüfen
+                sock.setblocking(False)
+                result = sock.connect_ex(sockaddr)
+                if result not in _CONNECT_PENDING:
+                    return False
+                _, writable, failed = select.select([], [sock], [sock], self.timeout)
+                if not writable or failed:
+                    return False
+                return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
         
         except Exception as e:
-            self.logger.error(f"Verbindungstest fehlgeschlagen: {e}")
+            logger.error("Verbindungstest fehlgeschlagen: %s", e)
             return False
+
+    def _ensure_connected(self) -> socket.socket:
+        """Liefert die persistente Verbindung und baut sie bei Bedarf auf"""
+        if self._sock is None:
+            self._sock = open_connection(self.host, self.port, self.timeout)
+        return self._sock
+
+    def _disconnect(self) -> None:
+        """Verwirft die persistente Verbindung samt gepufferter Restdaten"""
+        self._pending.clear()
+        if self._sock:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+    @staticmethod
+    def _split_responses(
+        data: Union[bytes, bytearray], limit: Optional[int] = None
+    ) -> Tuple[List[bytes], bytes]:
+        """Zerlegt empfangene Daten in vollständige LIMA-Antworten und Rest
+
+        XML-Antworten sind mit ihrem schließenden Tag vollständig, Klartext-
+        Antworten mit dem Zeilenende. Mit ``limit`` werden höchstens so viele
+        Antworten herausgelöst; alles Weitere bleibt im Rest.
+        """
+        responses: List[bytes] = []
+        start = 0
+        pos = 0
+        depth = 0
+        length = len(data)
+        while limit is None or len(responses) < limit:
+            if depth == 0:
+                # Leerraum zwischen zwei Antworten überspringen
+                while start < length and data[start] in b" \t\r\n":
+                    start += 1
+                pos = max(pos, start)
+                if start >= length:
+                    break
+                if data[start] != 0x3C:  # kein "<" -> Klartext bis Zeilenende
+                    end = data.find(b"\n", start)
+                    if end < 0:
+                        break
+                    responses.append(data[start:end].strip())
+                    start = pos = end + 1
+                    continue
+
+            match = _XML_TAG_RE.search(data, pos)
+            if not match:
+                break
+            tag = match.group(0)
+            pos = match.end()
+
+            if tag.startswith((b"<?", b"<!")):
+                continue  # XML-Deklaration gehört zur folgenden Antwort
+            if tag.startswith(b"</"):
+                depth -= 1
+            elif not tag.endswith(b"/>"):
+                depth += 1
+
+            if depth <= 0:
+                responses.append(data[start:pos].strip())
+                start = pos
+                depth = 0
+
+        return responses, data[start:]
+
+    def _receive_responses(self, sock: socket.socket, count: int) -> List[bytes]:
+        """Liest bis zu ``count`` aufeinanderfolgende Antworten von der Verbindung
+
+        Empfangene Daten werden in einem bytearray gesammelt; vollständige
+        Antworten werden sofort herausgelöst, sodass lange Antworten nicht bei
+        jedem Empfang komplett neu kopiert werden. Überzählige Antworten
+        bleiben für das nächste Kommando im Puffer. Kommen weniger als
+        ``count`` Antworten an, wird die Verbindung verworfen, damit verspätete
+        Antworten nicht späteren Kommandos zugeordnet werden; geliefert werden
+        dann nur die empfangenen Antworten.
+        """
+        collected: List[bytes] = []
+        pending = self._pending
+        if pending:
+            responses, rest = self._split_responses(pending, count)
+            collected.extend(bytes(response) for response in responses)
+            del pending[:len(pending) - len(rest)]
+
+        while len(collected) < count:
+            try:
+                n = sock.recv_into(self._rxview)
+            except socket.timeout:
+                if collected or pending.strip():
+                    return self._finish_incomplete(collected, count)
+                raise
+
+            if not n:
+                # Gegenstelle hat die Verbindung geschlossen
+                if collected or pending.strip():
+                    return self._finish_incomplete(collected, count)
+                self._disconnect()
+                raise ConnectionError("Verbindung von LIMA geschlossen")
+
+            pending += self._rxview[:n]
+            # Ohne Tag- oder Zeilenende kann keine Antwort vollständig sein
+            if self._rxbuf.find(b">", 0, n) < 0 and self._rxbuf.find(b"\n", 0, n) < 0:
+                continue
+
+            responses, rest = self._split_responses(pending, count - len(collected))
+            if responses:
+                collected.extend(bytes(response) for response in responses)
+                del pending[:len(pending) - len(rest)]
+        return collected
+
+    def _finish_incomplete(self, collected: List[bytes], count: int) -> List[bytes]:
+        """Liefert bei Timeout/EOF alle bisher empfangenen (auch unvollständigen) Antworten
+
+        Die Verbindung wird anschließend verworfen.
+        """
+        responses, rest = self._split_responses(self._pending)
+        collected.extend(bytes(response) for response in responses)
+        if rest.strip():
+            collected.append(bytes(rest.strip()))
+        self._disconnect()
+        return collected[:count]
     
-    def send_command(self, command: str) -> Optional[str]:
+    def send_command(self, command: Union[str, bytes]) -> Optional[str]:
         """Sendet LIMA-Kommando und wartet auf Antwort"""
+        return self.send_commands([command])[0]
+
+    def send_command_raw(self, command: Union[str, bytes]) -> bytes:
+        """Sendet LIMA-Kommando und liefert die Antwort als Bytes
+
+        Es wird nur Leerraum am Rand entfernt. Aufrufer dekodieren bei Bedarf
+        nur den Teil der Antwort, den sie tatsächlich benötigen.
+        """
+        return self.send_commands_raw([command])[0]
+
+    def send_commands(self, commands: List[Union[str, bytes]]) -> List[str]:
+        """Sendet mehrere LIMA-Kommandos gebündelt und liefert die Antworten"""
+        responses = self.send_commands_raw(commands)
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((self.host, self.port))
+            return [response.decode("utf-8") for response in responses]
+        except UnicodeDecodeError as e:
+            raise CommunicationError(
+                f"Ungültige Antwort auf Kommando {_command_label(commands)}: {e}"
+            )
+
+    def send_commands_raw(self, commands: List[Union[str, bytes]]) -> List[bytes]:
+        """Sendet mehrere LIMA-Kommandos in einem Schreibvorgang (Pipelining)
+
+        LIMA beantwortet die Kommandos der Reihe nach; die Antworten werden in
+        derselben Reihenfolge geliefert. Fehlende Antworten sind ``b""``.
+        Kommandos dürfen bereits kodiert sein (siehe Config.LIMA_COMMANDS_BYTES).
+        """
+        if not commands:
+            return []
+
+        future: Future = Future()
+        self._ensure_io_thread()
+        self._queue.put((list(commands), future))
+        try:
+            # Der I/O-Thread begrenzt jeden Empfang selbst mit self.timeout;
+            # je Kommando ist eine erneute Übertragung möglich, dazu kommt
+            # ein Timeout Wartezeit in der Queue
+            return future.result(timeout=(len(commands) + 1) * self.timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise CommunicationError(
+                f"Keine Antwort vom I/O-Thread für Kommando {_command_label(commands)}"
+            )
+
+    def _ensure_io_thread(self) -> None:
+        """Startet den I/O-Thread beim ersten Kommando (bzw. nach close())"""
+        io_thread = self._io_thread
+        if io_thread is not None and io_thread.is_alive():
+            return
+        with self._io_start_lock:
+            if self._io_thread is None or not self._io_thread.is_alive():
+                self._io_thread = threading.Thread(
+                    target=self._io_loop, name="LimaClientIO", daemon=True
+                )
+                self._io_thread.start()
+
+    def _io_loop(self) -> None:
+        """Arbeitet Aufträge ab; gleichzeitig wartende Aufträge werden gebündelt"""
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < _IO_BATCH_LIMIT:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            self._process_batch(batch)
+
+        self._disconnect()
+        # Nach close() eingereihte Aufträge nicht unbeantwortet lassen
+        self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        """Beendet alle noch wartenden Aufträge mit einem CommunicationError"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                continue
+            _, fut = item
+            if fut.set_running_or_notify_cancel():
+                fut.set_exception(CommunicationError("LIMA-Client wurde geschlossen"))
+
+    def _process_batch(self, batch: List[Tuple[List[str], Future]]) -> None:
+        """Sendet alle Kommandos eines Bündels und verteilt die Antworten"""
+        batch = [(cmds, fut) for cmds, fut in batch if fut.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        commands = [command for cmds, _ in batch for command in cmds]
+        try:
+            responses = self._transfer(commands)
+        except BaseException as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+
+        offset = 0
+        for cmds, fut in batch:
+            fut.set_result(responses[offset:offset + len(cmds)])
+            offset += len(cmds)
+
+    def _transfer(self, commands: List[Union[str, bytes]]) -> List[bytes]:
+        """Schreibt Kommandos und liest die Antworten (nur I/O-Thread)
+
+        Beantwortet die Gegenstelle nicht alle Kommandos einer Verbindung
+        (z.B. eine Antwort pro Verbindung), werden die offenen Kommandos über
+        eine neue Verbindung erneut gesendet, solange dabei noch Antworten
+        eintreffen. Danach fehlende Antworten sind ``b""``.
+        """
+        responses = self._transfer_once(commands)
+        while len(responses) < len(commands):
+            try:
+                received = self._transfer_once(commands[len(responses):])
+            except CommunicationError as e:
+                logger.warning("Keine weiteren LIMA-Antworten: %s", e)
+                received = []
+            if not received:
+                responses.extend([b""] * (len(commands) - len(responses)))
+                break
+            responses.extend(received)
+        return responses
+
+    def _transfer_once(self, commands: List[Union[str, bytes]]) -> List[bytes]:
+        """Sendet Kommandos über eine Verbindung und liefert die dort empfangenen Antworten"""
+        for attempt in range(2):
+            # Eine wiederverwendete Verbindung kann serverseitig bereits
+            # geschlossen sein -> dann genau einmal neu verbinden
+            reused = self._sock is not None
+            try:
+                sock = self._ensure_connected()
 
-                # LIMA-Kommando mit Newline senden
-                full_command = command + "\n"
-                sock.send(full_command.encode("utf-8"))
+                # LIMA-Kommandos jeweils mit Newline senden
+                sock.sendall(b"".join(map(_encode_command, commands)))
 
-                # Antwort empfangen (bis zu 4KB)
-                response = sock.recv(4096).decode("utf-8").strip()
-                self.logger.debug(
-                    "LIMA Kommando: %s -> Antwort: %s", command, response
-                )
+                responses = self._receive_responses(sock, len(commands))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "LIMA Kommando: %s -> Antwort: %s",
+                        _command_label(commands), responses,
+                    )
 
-                return response
+                return responses
 
-        except socket.timeout:
-            raise CommunicationError(
-                f"Timeout beim Senden des Kommandos: {command}"
-            )
-        except socket.error as e:
-            raise CommunicationError(
-                f"Socket-Fehler bei Kommando {command}: {e}"
-            )
-        except Exception as e:
-            raise CommunicationError(
-                f"Unerwarteter Fehler bei Kommando {command}: {e}"
-            )
+            except socket.timeout:
+                self._disconnect()
+                raise CommunicationError(
+                    f"Timeout beim Senden des Kommandos: {_command_label(commands)}"
+                )
+            except socket.error as e:
+                self._disconnect()
+                if reused and attempt == 0:
+                    continue
+                raise CommunicationError(
+                    f"Socket-Fehler bei Kommando {_command_label(commands)}: {e}"
+                )
+            except Exception as e:
+                self._disconnect()
+                raise CommunicationError(
+                    f"Unerwarteter Fehler bei Kommando {_command_label(commands)}: {e}"
+                )
+        return [b""] * len(commands)
     
-    def parse_lima_response(self, response: str) -> Dict[str, str]:
-        """Parst LIMA XML-Response"""
+    def parse_lima_response(self, response: Union[str, bytes]) -> Dict[str, str]:
+        """Parst LIMA XML-Response (als str oder direkt als empfangene Bytes)"""
+        parsed = _parse_lima_element(response)
+        if parsed is not None:
+            return parsed
+
         try:
-            # XML parsen
+            # XML parsen (Fallback für alles, was der Schnellpfad nicht abdeckt)
             root = ET.fromstring(response)
             
             # Alle Attribute des LIMA-Tags extrahieren
@@ -85,38 +633,118 @@ class LimaClient:
         
         except ET.ParseError as e:
             # Logge die komplette fehlerhafte XML-Antwort zur Analyse
-            self.logger.error(f"XML-Parse-Fehler: {e} - Antwort: {response}")
+            logger.error("XML-Parse-Fehler: %s - Antwort: %s", e, response)
             return {}
         except Exception as e:
-            self.logger.error(f"Fehler beim Parsen der LIMA-Response: {e}")
+            logger.error("Fehler beim Parsen der LIMA-Response: %s", e)
             return {}
     
-    def get_product_info(self, product_number: str) -> Optional[Dict[str, Any]]:
-        """Holt Produktinformationen von LIMA"""
+    def get_product_info(
+        self, product_number: str, materialize: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Holt Produktinformationen von LIMA
+
+        Große JSON-Payloads werden lazy geparst; nur gelesene Schlüssel werden
+        materialisiert. Mit ``materialize=True`` wird immer ein dict geliefert.
+        """
         try:
             # Beispiel-Kommando für Produktinfo (anzupassen je nach LIMA-Setup)
             command = f'<LIMA CMD="Project_GetNode" DIR="Request" PATH="Module Application.Product.{product_number}" />'
-            response = self.send_command(command)
+            response = self.send_command_raw(command)
             
             if response:
                 parsed = self.parse_lima_response(response)
                 if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
                     # JSON-Daten aus VALUE extrahieren falls vorhanden
+                    # (alle JSON-Parser melden Fehler als ValueError)
                     try:
-                        return json.loads(parsed['VALUE'])
-                    except json.JSONDecodeError:
+                        return _json_loads_lazy(parsed['VALUE'], materialize)
+                    except ValueError:
                         # Falls kein JSON, als String-Wert zurückgeben
                         return {'info': parsed['VALUE']}
             
             return None
         
         except Exception as e:
-            self.logger.error(f"Fehler beim Abrufen der Produktinfo: {e}")
+            logger.error("Fehler beim Abrufen der Produktinfo: %s", e)
             return None
     
+    def send_query_udp(self, command: Union[str, bytes], retries: int = 2) -> bytes:
+        """Sendet eine idempotente Abfrage per UDP (ohne Verbindungsaufbau)
+
+        Jede Abfrage nutzt einen eigenen, verbundenen Socket; so können
+        Antworten auf andere Abfragen nicht zugeordnet werden. Bei Timeout
+        wird die Abfrage bis zu ``retries`` Mal wiederholt.
+        """
+        if not self.udp_port:
+            raise CommunicationError("Kein UDP-Port konfiguriert")
+
+        payload = _encode_command(command)
+        try:
+            family, _, proto, sockaddr = _resolve(self.host, self.udp_port, socket.SOCK_DGRAM)
+            with socket.socket(family, socket.SOCK_DGRAM, proto) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(sockaddr)
+                for _ in range(retries + 1):
+                    try:
+                        sock.send(payload)
+                        return sock.recv(65535).strip()
+                    except socket.timeout:
+                        continue
+        except socket.error as e:
+            raise CommunicationError(f"UDP-Fehler bei Kommando {_command_label([command])}: {e}")
+
+        raise CommunicationError(f"Timeout bei UDP-Abfrage: {_command_label([command])}")
+    
     def close(self):
-        """Schließt die Verbindung"""
-        pass
+        """Schließt die Verbindung
+
+        Wartende Aufträge werden mit einem CommunicationError beendet; ein
+        bereits laufender Auftrag endet spätestens mit dem Socket-Timeout.
+        """
+        self._fail_queued()
+        io_thread = self._io_thread
+        if io_thread is not None and io_thread.is_alive():
+            # Der I/O-Thread schließt die Verbindung nach dem laufenden Auftrag
+            self._queue.put(None)
+            io_thread.join(timeout=self.timeout)
+            if not io_thread.is_alive():
+                self._io_thread = None
+        else:
+            self._io_thread = None
+            self._disconnect()
+
+
+def _parse_pose_xyz(value: str) -> Optional[Tuple[float, float, float]]:
+    """Parst eine TCP-Pose "X,Y,Z,RX,RY,RZ" und liefert nur X, Y, Z"""
+    # Nur X, Y, Z abtrennen; RX,RY,RZ bleiben als ein ungeparster Rest
+    pose_values = value.split(',', 3)
+    if len(pose_values) < 3:
+        return None
+    x, y, z = map(float, pose_values[:3])
+    return (x, y, z)
+
+
+# Konverter für VALUE-Attribute je LIMA-Kommando (Standard: unveränderter String)
+_LIMA_VALUE_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "get_tcp_pose": _parse_pose_xyz,
+}
+
+# Idempotente Abfragen, die bei konfiguriertem UDP-Port per UDP laufen
+_UDP_QUERIES = frozenset({"get_focus", "get_tcp_pose"})
+
+# Mapping von zulässigen AF-Feldnamen zu LIMA-Kommandos, einmalig beim Import
+# gegen Validator.validate_af_field abgeglichen und schreibgeschützt
+# (ein Lookup pro Abfrage)
+_AF_FIELD_COMMANDS: Mapping[str, str] = MappingProxyType({
+    field: command_key
+    for field, command_key in (
+        ("AF Breite", "af_width"),
+        ("AF Höhe", "af_height"),
+        ("AF Tiefe", "af_depth"),
+    )
+    if Validator.validate_af_field(field)
+})
 
 
 class RobotCommunicator:
@@ -124,150 +752,112 @@ class RobotCommunicator:
     
     def __init__(self, lima_client: LimaClient):
         self.lima_client = lima_client
-        self.logger = logging.getLogger(__name__)
     
+    def _query_replies(self, *command_keys: str) -> List[Dict[str, str]]:
+        """Sendet Kommandos aus Config.LIMA_COMMANDS gebündelt und parst die Antworten"""
+        commands = []
+        for key in command_keys:
+            if key not in Config.LIMA_COMMANDS_BYTES:
+                raise ValueError(f"Unbekanntes LIMA-Kommando: {key}")
+            commands.append(Config.LIMA_COMMANDS_BYTES[key])
+
+        responses = self.lima_client.send_commands_raw(commands)
+        return [
+            self.lima_client.parse_lima_response(response) if response else {}
+            for response in responses
+        ]
+
+    def _query_reply(self, command_key: str) -> Dict[str, str]:
+        """Sendet ein Kommando aus Config.LIMA_COMMANDS und liefert die geparste Antwort"""
+        return self._query_replies(command_key)[0]
+
+    @staticmethod
+    def _reply_value(command_key: str, parsed: Dict[str, str]) -> Any:
+        """Liefert den über _LIMA_VALUE_PARSERS konvertierten VALUE einer ReplyOk-Antwort"""
+        if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
+            parser = _LIMA_VALUE_PARSERS.get(command_key)
+            return parser(parsed['VALUE']) if parser else parsed['VALUE']
+        return None
+
+    def _query_value(self, command_key: str) -> Any:
+        """Fragt einen einzelnen Wert ab (gleicher Pfad wie batch_query)
+
+        Idempotente Abfragen laufen per UDP, falls der LimaClient einen
+        UDP-Port hat.
+        """
+        if command_key in _UDP_QUERIES and self.lima_client.udp_port:
+            response = self.lima_client.send_query_udp(Config.LIMA_COMMANDS_BYTES[command_key])
+            parsed = self.lima_client.parse_lima_response(response) if response else {}
+            return self._reply_value(command_key, parsed)
+        return self.batch_query(command_key)[command_key]
+
+    def batch_query(self, *command_keys: str) -> Dict[str, Any]:
+        """Fragt mehrere Werte mit einem Roundtrip ab
+
+        Die Schlüssel entsprechen Config.LIMA_COMMANDS, z.B.
+        ``batch_query("get_focus", "get_tcp_pose")``. Nicht verfügbare Werte
+        sind ``None``.
+        """
+        replies = self._query_replies(*command_keys)
+        return {
+            key: self._reply_value(key, parsed)
+            for key, parsed in zip(command_keys, replies)
+        }
+
     def start_autofocus(self) -> bool:
         """Startet den Autofokus mit korrektem LIMA-Kommando"""
-        try:
-            # Autofokus auf "Once" setzen (Wert 1)
-            command = Config.LIMA_COMMANDS["autofocus"]
-            response = self.lima_client.send_command(command)
-            
-            if response:
-                parsed = self.lima_client.parse_lima_response(response)
-                return parsed.get('DIR') == 'ReplyOk'
-            
-            return False
-        
-        except CommunicationError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Starten des Autofokus: {e}")
+        # Autofokus auf "Once" setzen (Wert 1)
+        return self._query_reply("autofocus").get('DIR') == 'ReplyOk'
     
     def send_trigger(self) -> bool:
         """Sendet Trigger-Signal"""
-        try:
-            response = self.lima_client.send_command("<T/>")
-            return response == "<TOk/>"
-        
-        except CommunicationError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Senden des Triggers: {e}")
+        response = self.lima_client.send_command_raw(Config.LIMA_COMMANDS_BYTES["trigger"])
+        return response == b"<TOk/>"
     
     def get_focus_value(self) -> Optional[str]:
         """Holt aktuellen Fokuswert"""
-        try:
-            command = Config.LIMA_COMMANDS["get_focus"]
-            response = self.lima_client.send_command(command)
-            
-            if response:
-                parsed = self.lima_client.parse_lima_response(response)
-                if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
-                    return parsed['VALUE']
-            
-            return None
-        
-        except CommunicationError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Abrufen des Fokuswerts: {e}")
+        return self._query_value("get_focus")
     
     def get_af_value(self, field: str) -> Optional[str]:
         """Holt spezifischen AF-Wert mit korrekten LIMA-Kommandos"""
-        try:
-            # Feld validieren
-            if not Validator.validate_af_field(field):
-                raise ValueError(f"Ungültiges AF-Feld: {field}")
-            
-            # Mapping von Feldnamen zu LIMA-Kommandos
-            command_mapping = {
-                "AF Breite": Config.LIMA_COMMANDS["af_width"],
-                "AF Höhe": Config.LIMA_COMMANDS["af_height"], 
-                "AF Tiefe": Config.LIMA_COMMANDS["af_depth"]
-            }
-            
-            command = command_mapping.get(field)
-            if not command:
-                raise ValueError(f"Kein LIMA-Kommando für Feld: {field}")
-            
-            response = self.lima_client.send_command(command)
-            
-            if response:
-                parsed = self.lima_client.parse_lima_response(response)
-                if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
-                    return parsed['VALUE']
-                elif parsed.get('DIR') == 'ReplyError':
-                    error_msg = parsed.get('INFO', 'Unbekannter LIMA-Fehler')
-                    self.logger.error(f"LIMA-Fehler für {field}: {error_msg}")
-                    raise CommunicationError(f"LIMA-Fehler: {error_msg}")
-            
-            return None
+        # Feld validieren (vor jeglicher Netzwerkkommunikation)
+        command_key = _AF_FIELD_COMMANDS.get(field) if isinstance(field, str) else None
+        if command_key is None:
+            raise ValueError(f"Ungültiges AF-Feld: {field}")
         
-        except CommunicationError:
-            raise
-        except ValueError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Abrufen des AF-Werts {field}: {e}")
+        parsed = self._query_reply(command_key)
+        if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
+            return parsed['VALUE']
+        elif parsed.get('DIR') == 'ReplyError':
+            error_msg = parsed.get('INFO', 'Unbekannter LIMA-Fehler')
+            logger.error("LIMA-Fehler für %s: %s", field, error_msg)
+            raise CommunicationError(f"LIMA-Fehler: {error_msg}")
+        
+        return None
     
     def get_af_origin_xyz(self) -> Optional[Tuple[float, float, float]]:
         """Holt AF-Ursprung XYZ-Koordinaten"""
-        try:
-            # X, Y, Z einzeln abrufen
-            x_cmd = Config.LIMA_COMMANDS["af_origin_x"]
-            y_cmd = Config.LIMA_COMMANDS["af_origin_y"]
-            z_cmd = Config.LIMA_COMMANDS["af_origin_z"]
-            
-            x_response = self.lima_client.send_command(x_cmd)
-            y_response = self.lima_client.send_command(y_cmd)
-            z_response = self.lima_client.send_command(z_cmd)
-            
-            x_parsed = self.lima_client.parse_lima_response(x_response) if x_response else {}
-            y_parsed = self.lima_client.parse_lima_response(y_response) if y_response else {}
-            z_parsed = self.lima_client.parse_lima_response(z_response) if z_response else {}
-            
-            # Werte extrahieren
-            x_val = x_parsed.get('VALUE')
-            y_val = y_parsed.get('VALUE')
-            z_val = z_parsed.get('VALUE')
-            
-            if all([x_val, y_val, z_val]):
+        # X, Y, Z gebündelt in einem Roundtrip abrufen
+        x_val, y_val, z_val = (
+            parsed.get('VALUE')
+            for parsed in self._query_replies("af_origin_x", "af_origin_y", "af_origin_z")
+        )
+        
+        # Leere oder fehlende Werte -> kein Ursprung ("0" ist ein gültiger Wert)
+        if x_val and y_val and z_val:
+            try:
                 return (float(x_val), float(y_val), float(z_val))
-            
-            return None
+            except ValueError as e:
+                raise CommunicationError(f"Ungültiges XYZ-Format: {e}")
         
-        except ValueError as e:
-            raise CommunicationError(f"Ungültiges XYZ-Format: {e}")
-        except CommunicationError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Abrufen der AF-Ursprung XYZ: {e}")
+        return None
     
     def get_current_position(self) -> Optional[Tuple[float, float, float]]:
         """Holt aktuelle TCP-Position vom Robot"""
         try:
-            command = Config.LIMA_COMMANDS["get_tcp_pose"]
-            response = self.lima_client.send_command(command)
-            
-            if response:
-                parsed = self.lima_client.parse_lima_response(response)
-                if parsed.get('DIR') == 'ReplyOk' and 'VALUE' in parsed:
-                    # TCP Pose Format: "X,Y,Z,RX,RY,RZ" - nur X,Y,Z nehmen
-                    pose_str = parsed['VALUE']
-                    pose_values = pose_str.split(',')
-                    if len(pose_values) >= 3:
-                        x, y, z = map(float, pose_values[:3])
-                        return (x, y, z)
-            
-            return None
-        
+            return self._query_value("get_tcp_pose")
         except ValueError as e:
             raise CommunicationError(f"Ungültiges Positionsformat: {e}")
-        except CommunicationError:
-            raise
-        except Exception as e:
-            raise CommunicationError(f"Fehler beim Abrufen der Position: {e}")
 
 
 class ListenerMode:
@@ -294,14 +884,32 @@ class ListenerMode:
         self.client_socket: Optional[socket.socket] = None
         self.running = False
 
+        # Worker-Pool für die Verarbeitung empfangener Client-Nachrichten
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        # Wiederverwendeter Empfangspuffer (nur im Listener-Thread)
+        self._rxbuf = bytearray(65536)
+        self._rxview = memoryview(self._rxbuf)
+
+        # Socket-Paar zum sofortigen Aufwecken des Selectors beim Stoppen
+        self._wakeup_recv: Optional[socket.socket] = None
+        self._wakeup_send: Optional[socket.socket] = None
+
         # Handler für eingehende Nachrichten und optionale Log-Events
         self.message_handler: Optional[Callable[[str, str], None]] = None
         self.log_callback: Optional[Callable[[Dict[str, Any]], None]] = None
 
+        # Log-Events werden von einem eigenen Thread an log_callback übergeben,
+        # damit Empfangs- und Worker-Threads nicht auf die UI warten
+        self._log_queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._log_thread: Optional[threading.Thread] = None
+
         # Internes Nachrichten-Log
-        self.message_log: List[Dict[str, Any]] = []
+        # Ringpuffer der letzten 100 Events
+        self.message_log: Deque[Dict[str, Any]] = deque(maxlen=100)
+        # Anzahl aller Events seit Start/letztem Leeren (nicht auf 100 begrenzt)
+        self.message_count = 0
 
-        self.logger = logging.getLogger(__name__)
 
     @staticmethod
     def _split_messages(buffer: str) -> Tuple[List[str], str]:
@@ -319,6 +927,30 @@ class ListenerMode:
                 messages.append(message)
         return messages, buffer
 
+    @staticmethod
+    def _split_message_bytes(pending: bytearray) -> List[str]:
+        """Wie _split_messages, arbeitet aber direkt auf dem Empfangspuffer
+
+        Vollständige Nachrichten werden dekodiert und aus ``pending`` entfernt,
+        der Rest bleibt für den nächsten Empfang im Puffer.
+        """
+        messages: List[str] = []
+        start = 0
+        while True:
+            pos, term_len = -1, 0
+            for term in _MESSAGE_TERMINATORS:
+                found = pending.find(term, start)
+                if found != -1 and (pos == -1 or found < pos):
+                    pos, term_len = found, len(term)
+            if pos == -1:
+                break
+            message = pending[start:pos].decode("utf-8", errors="ignore").strip()
+            start = pos + term_len
+            if message:
+                messages.append(message)
+        del pending[:start]
+        return messages
+
     def start(
         self,
         message_handler: Callable[[str, str], None],
@@ -337,6 +969,21 @@ class ListenerMode:
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server_socket.bind(("", self.listen_port))
             self.server_socket.listen(5)
+            self.server_socket.setblocking(False)
+
+            self._wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._wakeup_recv.setblocking(False)
+
+            self._pool = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 4) * 4),
+                thread_name_prefix="ListenerWorker",
+            )
+
+            if log_callback:
+                self._log_thread = threading.Thread(
+                    target=self._log_dispatch_loop, name="ListenerLog", daemon=True
+                )
+                self._log_thread.start()
 
             # Listener-Thread starten
             self.running = True
@@ -348,7 +995,7 @@ class ListenerMode:
                 self.client_thread = threading.Thread(target=self._client_loop, daemon=True)
                 self.client_thread.start()
 
-            self.logger.info(f"Listener gestartet auf Port {self.listen_port}")
+            logger.info("Listener gestartet auf Port %s", self.listen_port)
             self._log_event(
                 "LISTENER_STARTED",
                 f"Listener auf Port {self.listen_port} gestartet",
@@ -357,7 +1004,7 @@ class ListenerMode:
             return True
 
         except Exception as e:
-            self.logger.error(f"Fehler beim Starten des Listeners: {e}")
+            logger.error("Fehler beim Starten des Listeners: %s", e)
             self.stop()
             return False
     
@@ -365,6 +1012,13 @@ class ListenerMode:
         """Stoppt den Listener"""
         self.running = False
 
+        # Selector-Schleife aufwecken statt auf den Timeout zu warten
+        if self._wakeup_send:
+            try:
+                self._wakeup_send.send(b"\0")
+            except Exception:
+                pass
+
         if self.server_socket:
             try:
                 self.server_socket.close()
@@ -385,10 +1039,30 @@ class ListenerMode:
         if self.client_thread and self.client_thread.is_alive():
             self.client_thread.join(timeout=2.0)
 
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
         self.listener_thread = None
         self.client_thread = None
 
-        self.logger.info("Listener gestoppt")
+        for wakeup_socket in (self._wakeup_recv, self._wakeup_send):
+            if wakeup_socket:
+                try:
+                    wakeup_socket.close()
+                except Exception:
+                    pass
+        self._wakeup_recv = None
+        self._wakeup_send = None
+
+        log_thread = self._log_thread
+        if log_thread:
+            self._log_queue.put(None)
+            log_thread.join(timeout=2.0)
+            self._log_thread = None
+            self._drain_log_queue()
+
+        logger.info("Listener gestoppt")
         self._log_event("LISTENER_STOPPED", "Listener gestoppt", "SYSTEM")
     
     def is_running(self) -> bool:
@@ -396,43 +1070,164 @@ class ListenerMode:
         return bool(self.running and self.listener_thread and self.listener_thread.is_alive())
 
     def _listener_loop(self):
-        """Haupt-Listener-Schleife"""
-        while self.running and self.server_socket:
-            try:
-                # Auf Verbindung warten (mit Timeout)
-                self.server_socket.settimeout(1.0)
-                client_socket, address = self.server_socket.accept()
-                
-                # Client-Handler starten
-                client_thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket, address),
-                    daemon=True
+        """Haupt-Listener-Schleife (ein Selector für alle Client-Verbindungen)"""
+        selector = selectors.DefaultSelector()
+        connections: Dict[socket.socket, Dict[str, Any]] = {}
+        try:
+            selector.register(self.server_socket, selectors.EVENT_READ)
+            if self._wakeup_recv:
+                selector.register(self._wakeup_recv, selectors.EVENT_READ)
+
+            while self.running and self.server_socket:
+                events = selector.select(timeout=Config.LISTENER_TIMEOUT)
+                if not self.running:
+                    break
+
+                for key, _ in events:
+                    sock = key.fileobj
+                    if sock is self.server_socket:
+                        self._accept_client(selector, connections)
+                    elif sock is self._wakeup_recv:
+                        try:
+                            sock.recv(64)
+                        except OSError:
+                            pass
+                    else:
+                        self._read_client(selector, connections, sock)
+
+                self._flush_idle_clients(selector, connections)
+
+        except Exception as e:
+            if self.running:  # Nur loggen wenn wir noch laufen sollten
+                logger.error("Fehler im Listener-Loop: %s", e)
+                self._log_event(
+                    "SERVER_ERROR", f"Listener-Loop-Fehler: {e}", "SYSTEM"
                 )
-                client_thread.start()
-            
-            except socket.timeout:
-                continue  # Timeout ist normal
-            except Exception as e:
-                if self.running:  # Nur loggen wenn wir noch laufen sollten
-                    self.logger.error(f"Fehler im Listener-Loop: {e}")
-                    self._log_event(
-                        "SERVER_ERROR", f"Listener-Loop-Fehler: {e}", "SYSTEM"
-                    )
-                break
+        finally:
+            for client_socket in list(connections):
+                self._drop_client(selector, connections, client_socket)
+                try:
+                    client_socket.close()
+                except Exception:
+                    pass
+            selector.close()
+
+    def _accept_client(
+        self,
+        selector: selectors.BaseSelector,
+        connections: Dict[socket.socket, Dict[str, Any]],
+    ) -> None:
+        """Nimmt eine neue Verbindung an und registriert sie beim Selector"""
+        try:
+            client_socket, address = self.server_socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+
+        client_socket.setblocking(False)
+        _configure_socket(client_socket)
+        sender_ip = address[0]
+        logger.info("Client verbunden: %s", sender_ip)
+        self._log_event("CLIENT_CONNECTED", f"Verbunden mit {sender_ip}", sender_ip)
+
+        selector.register(client_socket, selectors.EVENT_READ)
+        connections[client_socket] = {
+            "address": address,
+            "buffer": bytearray(),
+            "last_data": time.monotonic(),
+        }
+
+    def _read_client(
+        self,
+        selector: selectors.BaseSelector,
+        connections: Dict[socket.socket, Dict[str, Any]],
+        client_socket: socket.socket,
+    ) -> None:
+        """Liest verfügbare Daten und verarbeitet die Nachricht
+
+        Wie bisher gilt ein Empfang als vollständige Nachricht. Nur wenn der
+        Empfangspuffer komplett gefüllt wurde und kein Terminator (END, CR
+        oder LF) enthalten ist, wird auf weitere Daten gewartet.
+        """
+        state = connections.get(client_socket)
+        if state is None:
+            return
+
+        try:
+            n = client_socket.recv_into(self._rxview)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            logger.error("Fehler beim Lesen von Client %s: %s", state['address'], e)
+            self._drop_client(selector, connections, client_socket)
+            client_socket.close()
+            return
+
+        if n:
+            buffer = state["buffer"]
+            buffer += self._rxview[:n]
+            state["last_data"] = time.monotonic()
+            if n == len(self._rxbuf):
+                # Terminator darf über die Empfangsgrenze reichen ("END")
+                tail = buffer[-(n + 2):]
+                if not any(term in tail for term in _MESSAGE_TERMINATORS):
+                    return
+
+        self._drop_client(selector, connections, client_socket)
+        self._dispatch_client(client_socket, state["address"], bytes(state["buffer"]))
+
+    def _flush_idle_clients(
+        self,
+        selector: selectors.BaseSelector,
+        connections: Dict[socket.socket, Dict[str, Any]],
+    ) -> None:
+        """Verarbeitet gepufferte Teilnachrichten, wenn keine weiteren Daten folgen"""
+        deadline = time.monotonic() - Config.LISTENER_TIMEOUT
+        for client_socket, state in list(connections.items()):
+            if state["buffer"] and state["last_data"] < deadline:
+                self._drop_client(selector, connections, client_socket)
+                self._dispatch_client(client_socket, state["address"], bytes(state["buffer"]))
+
+    def _dispatch_client(
+        self, client_socket: socket.socket, address: Tuple[str, int], raw: bytes
+    ) -> None:
+        """Übergibt eine vollständige Client-Nachricht an den Worker-Pool"""
+        pool = self._pool
+        if pool is None:
+            self._handle_client(client_socket, address, raw)
+            return
+        try:
+            pool.submit(self._handle_client, client_socket, address, raw)
+        except RuntimeError:
+            # Pool wurde bereits heruntergefahren (Listener stoppt)
+            client_socket.close()
+
+    @staticmethod
+    def _drop_client(
+        selector: selectors.BaseSelector,
+        connections: Dict[socket.socket, Dict[str, Any]],
+        client_socket: socket.socket,
+    ) -> None:
+        """Entfernt eine Client-Verbindung aus dem Selector"""
+        connections.pop(client_socket, None)
+        try:
+            selector.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
 
     def _client_loop(self):
         """Verbindet sich als TCP-Client mit der Kamera und empfängt Nachrichten"""
         backoff = 1
+        # Eigener Empfangspuffer, der Listener-Thread läuft parallel
+        rxview = memoryview(bytearray(65536))
         while self.running and self.camera_ip:
             try:
-                self.client_socket = socket.create_connection(
-                    (self.camera_ip, self.camera_port), timeout=5
+                self.client_socket = open_connection(
+                    self.camera_ip, self.camera_port, 5
                 )
                 sock = self.client_socket
                 sock.settimeout(1.0)
-                self.logger.info(
-                    f"Kamera verbunden: {self.camera_ip}:{self.camera_port}"
+                logger.info(
+                    "Kamera verbunden: %s:%s", self.camera_ip, self.camera_port
                 )
                 self._log_event(
                     "CLIENT_CONNECTED",
@@ -440,16 +1235,15 @@ class ListenerMode:
                     self.camera_ip,
                 )
                 backoff = 1
-                buffer = ""
+                pending = bytearray()
 
                 while self.running:
                     try:
-                        data = sock.recv(4096)
-                        if not data:
+                        n = sock.recv_into(rxview)
+                        if not n:
                             raise ConnectionError("Verbindung zur Kamera getrennt")
-                        buffer += data.decode("utf-8", errors="ignore")
-                        messages, buffer = self._split_messages(buffer)
-                        for line in messages:
+                        pending += rxview[:n]
+                        for line in self._split_message_bytes(pending):
                             self._log_event(
                                 "MESSAGE_RECEIVED", line, self.camera_ip
                             )
@@ -460,8 +1254,8 @@ class ListenerMode:
 
             except Exception as e:
                 if self.running:
-                    self.logger.warning(
-                        f"Kamera-Client-Verbindung fehlgeschlagen: {e}"
+                    logger.warning(
+                        "Kamera-Client-Verbindung fehlgeschlagen: %s", e
                     )
                     self._log_event(
                         "CLIENT_ERROR",
@@ -480,15 +1274,13 @@ class ListenerMode:
                         pass
                 self.client_socket = None
     
-    def _handle_client(self, client_socket: socket.socket, address: Tuple[str, int]):
-        """Behandelt einzelne Client-Verbindung"""
+    def _handle_client(
+        self, client_socket: socket.socket, address: Tuple[str, int], raw: bytes
+    ):
+        """Verarbeitet die empfangene Nachricht eines Clients und bestätigt sie"""
+        sender_ip = address[0]
         try:
-            sender_ip = address[0]
-            self.logger.info(f"Client verbunden: {sender_ip}")
-            self._log_event("CLIENT_CONNECTED", f"Verbunden mit {sender_ip}", sender_ip)
-
-            # Nachricht empfangen
-            data = client_socket.recv(4096).decode("utf-8", errors="ignore").strip()
+            data = raw.decode("utf-8", errors="ignore").strip()
             self._log_event("MESSAGE_RECEIVED", data, sender_ip)
 
             if data and self.message_handler:
@@ -496,10 +1288,11 @@ class ListenerMode:
 
                 # Bestätigung senden
                 response = "MESSAGE_RECEIVED"
-                client_socket.send(response.encode("utf-8"))
+                client_socket.settimeout(Config.SOCKET_TIMEOUT)
+                client_socket.sendall(response.encode("utf-8"))
         
         except Exception as e:
-            self.logger.error(f"Fehler beim Behandeln des Clients {address}: {e}")
+            logger.error("Fehler beim Behandeln des Clients %s: %s", address, e)
             self._log_event(
                 "SERVER_ERROR", f"Client-Handler-Fehler: {e}", sender_ip
             )
@@ -513,21 +1306,18 @@ class ListenerMode:
     def send_message(self, message: str) -> bool:
         """Sendet Nachricht an konfigurierte Ziel-IP"""
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(5.0)
-                sock.connect((self.send_ip, self.send_port))
+            with open_connection(self.send_ip, self.send_port, 5.0) as sock:
 
-                sock.send(message.encode("utf-8"))
+                sock.sendall(message.encode("utf-8"))
 
                 # Ausgehende Nachricht loggen (einmalig)
                 self._log_event("MESSAGE_SENT", message, self.send_ip)
 
-                # Bestätigung empfangen
-                response = sock.recv(1024).decode("utf-8", errors="ignore").strip()
-                return response == "MESSAGE_RECEIVED"
+                # Bestätigung empfangen (ohne Dekodieren vergleichen)
+                return sock.recv(1024).strip() == b"MESSAGE_RECEIVED"
 
         except Exception as e:
-            self.logger.error(f"Fehler beim Senden der Nachricht: {e}")
+            logger.error("Fehler beim Senden der Nachricht: %s", e)
             self._log_event(
                 "CLIENT_ERROR", f"Senden fehlgeschlagen: {e}", self.send_ip
             )
@@ -536,61 +1326,164 @@ class ListenerMode:
     def _log_event(self, event_type: str, message: str, source: str):
         """Loggt ein Event mit Timestamp"""
         event = {
-            'timestamp': datetime.now().strftime('%H:%M:%S.%f')[:-3],  # Mit Millisekunden
+            'timestamp': _event_timestamp(),  # Mit Millisekunden
             'type': event_type,
             'message': message,
             'source': source
         }
         
         self.message_log.append(event)
+        self.message_count += 1
         
-        # Log-Callback aufrufen falls gesetzt
-        if self.log_callback:
+        # Log-Callback aufrufen falls gesetzt (über den Log-Thread, falls aktiv)
+        if self._log_thread is not None:
+            self._log_queue.put(event)
+        elif self.log_callback:
+            self._notify_log_callback(event)
+
+    def _notify_log_callback(self, event: Dict[str, Any]) -> None:
+        """Ruft log_callback auf; Fehler im Callback werden nur geloggt"""
+        callback = self.log_callback
+        if callback:
             try:
-                self.log_callback(event)
+                callback(event)
             except Exception as e:
-                self.logger.error(f"Fehler im Log-Callback: {e}")
-        
-        # Log-Größe begrenzen (letzte 100 Einträge behalten)
-        if len(self.message_log) > 100:
-            self.message_log = self.message_log[-100:]
+                logger.error("Fehler im Log-Callback: %s", e)
+
+    def _log_dispatch_loop(self) -> None:
+        """Übergibt anstehende Log-Events gebündelt an log_callback"""
+        while True:
+            event = self._log_queue.get()
+            batch = [event]
+            while event is not None and len(batch) < _LOG_BATCH_LIMIT:
+                try:
+                    event = self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(event)
+
+            for event in batch:
+                if event is None:
+                    return
+                self._notify_log_callback(event)
+
+    def _drain_log_queue(self) -> None:
+        """Reicht nach dem Stoppen des Log-Threads verbliebene Events direkt weiter"""
+        while True:
+            try:
+                event = self._log_queue.get_nowait()
+            except queue.Empty:
+                return
+            if event is not None:
+                self._notify_log_callback(event)
     
     def get_message_log(self) -> List[Dict[str, Any]]:
         """Gibt das aktuelle Message-Log zurück"""
-        return self.message_log.copy()
+        return list(self.message_log)
     
     def clear_message_log(self):
         """Leert das Message-Log"""
         self.message_log.clear()
+        self.message_count = 0
 
 
 class CobotCommunicator:
-    """Direkte Kommunikation mit dem Cobot (falls erforderlich)"""
+    """Direkte Kommunikation mit dem Cobot (falls erforderlich)
+
+    Wie beim LimaClient wird eine persistente Verbindung genutzt.
+    """
     
-    def __init__(self, cobot_ip: str, cobot_port: int, timeout: float = 10.0):
+    def __init__(
+        self,
+        cobot_ip: str,
+        cobot_port: int,
+        timeout: float = 10.0,
+        udp_port: Optional[int] = None,
+    ):
         self.cobot_ip = cobot_ip
         self.cobot_port = cobot_port
         self.timeout = timeout
-        self.logger = logging.getLogger(__name__)
+        # Optionaler UDP-Port für Statusabfragen (None = nur TCP)
+        self.udp_port = udp_port
+
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._rxbuf = bytearray(1024)
+        self._rxview = memoryview(self._rxbuf)
+
+    def _ensure_connected(self) -> socket.socket:
+        """Liefert die persistente Verbindung und baut sie bei Bedarf auf"""
+        if self._sock is None:
+            self._sock = open_connection(
+                self.cobot_ip, self.cobot_port, self.timeout
+            )
+        return self._sock
+
+    def _disconnect(self) -> None:
+        """Verwirft die persistente Verbindung"""
+        if self._sock:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+    def _request(self, message: bytes) -> bytes:
+        """Sendet eine Nachricht über die persistente Verbindung und liefert die Antwort"""
+        with self._lock:
+            for attempt in range(2):
+                reused = self._sock is not None
+                try:
+                    sock = self._ensure_connected()
+                    sock.sendall(message)
+                    n = sock.recv_into(self._rxview)
+                    if not n:
+                        raise ConnectionError("Verbindung vom Cobot geschlossen")
+                    return bytes(self._rxview[:n]).strip()
+                except socket.timeout:
+                    self._disconnect()
+                    raise
+                except socket.error:
+                    self._disconnect()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+        return b""
+
+    def _request_udp(self, message: bytes, retries: int = 2) -> bytes:
+        """Sendet eine idempotente Abfrage per UDP und liefert die Antwort
+
+        Der Socket wird mit dem Cobot verbunden; Datagramme anderer Absender
+        verwirft das Betriebssystem.
+        """
+        family, _, proto, sockaddr = _resolve(self.cobot_ip, self.udp_port, socket.SOCK_DGRAM)
+        with socket.socket(family, socket.SOCK_DGRAM, proto) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(sockaddr)
+            for _ in range(retries + 1):
+                try:
+                    sock.send(message)
+                    return sock.recv(1500).strip()
+                except socket.timeout:
+                    continue
+        raise socket.timeout("Keine UDP-Antwort vom Cobot")
     
     def send_position_data(self, positions: Dict[str, Any]) -> bool:
-        """Sendet Positionsdaten an den Cobot"""
+        """Sendet Positionsdaten an den Cobot
+
+        Die Werte dürfen Listen, numpy-Arrays oder Dataclasses sein; Arrays
+        werden von orjson ohne Umweg über Python-Floats serialisiert.
+        """
         try:
-            # Positionsdaten in JSON umwandeln
-            data = json.dumps(positions)
-            message = f"POSITION_DATA:{data}"
+            # Positionsdaten direkt als JSON-Bytes aufbauen
+            message = b"POSITION_DATA:" + _json_dumps(positions)
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((self.cobot_ip, self.cobot_port))
-                sock.send(message.encode("utf-8"))
-                
-                # Bestätigung empfangen
-                response = sock.recv(1024).decode("utf-8").strip()
-                return response == "POSITIONS_RECEIVED"
+            # Bestätigung empfangen
+            response = self._request(message)
+            return response == b"POSITIONS_RECEIVED"
         
         except Exception as e:
-            self.logger.error(f"Fehler beim Senden der Positionsdaten: {e}")
+            logger.error("Fehler beim Senden der Positionsdaten: %s", e)
             return False
     
     def send_program_start(self, program_name: str) -> bool:
@@ -598,34 +1491,33 @@ class CobotCommunicator:
         try:
             message = f"START_PROGRAM:{program_name}"
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((self.cobot_ip, self.cobot_port))
-                sock.send(message.encode("utf-8"))
-                
-                response = sock.recv(1024).decode("utf-8").strip()
-                return response == "PROGRAM_STARTED"
+            response = self._request(message.encode("utf-8"))
+            return response == b"PROGRAM_STARTED"
         
         except Exception as e:
-            self.logger.error(f"Fehler beim Starten des Cobot-Programms: {e}")
+            logger.error("Fehler beim Starten des Cobot-Programms: %s", e)
             return False
     
     def get_cobot_status(self) -> Optional[str]:
         """Holt aktuellen Cobot-Status"""
         try:
-            message = "GET_STATUS"
+            message = b"GET_STATUS"
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((self.cobot_ip, self.cobot_port))
-                sock.send(message.encode("utf-8"))
-                
-                response = sock.recv(1024).decode("utf-8").strip()
-                if response.startswith("STATUS:"):
-                    return response[7:]  # "STATUS:" entfernen
-                
-                return None
+            if self.udp_port:
+                response = self._request_udp(message)
+            else:
+                response = self._request(message)
+            prefix, sep, payload = response.partition(b":")
+            if sep and prefix == b"STATUS":
+                return payload.decode("utf-8")
+            
+            return None
         
         except Exception as e:
-            self.logger.error(f"Fehler beim Abrufen des Cobot-Status: {e}")
+            logger.error("Fehler beim Abrufen des Cobot-Status: %s", e)
             return None
+
+    def close(self):
+        """Schließt die Verbindung"""
+        with self._lock:
+            self._disconnect()
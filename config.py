@@ -2,8 +2,18 @@
 Zentralisierte Konfiguration für den THT-Produktmanager
 """
 from typing import Dict, Any
+from functools import lru_cache
 import os
 import re
+
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+@lru_cache(maxsize=None)
+def _generic_field_code(field: str) -> str:
+    """Generische Kurzbezeichnung (Großbuchstaben ohne Sonderzeichen)"""
+    return _NON_WORD_RE.sub("", field).upper()
+
 
 class Config:
     # Datenbankeinstellungen
@@ -19,6 +29,7 @@ class Config:
     # UI-Einstellungen
     WINDOW_SIZE = (1400, 800)
     SIDEBAR_WIDTH = 200
+    LISTENER_LOG_MAX_LINES = 10000
     
     # Standard LIMA-Konfiguration
     DEFAULT_LIMA_CONFIG = {
@@ -54,6 +65,12 @@ class Config:
         "PosPCB_0", "PosPCB_1", "PosPCB_2", "PosPCB_3", "PosPCB_4"
     ]
 
+    # Alle Felder in der korrekten Reihenfolge (einmalig zusammengesetzt)
+    ALL_FIELDS = tuple(
+        BASIC_FIELDS + DIMENSION_FIELDS + PCB_FIELDS + AF_FIELDS +
+        EXTRA_FIELDS + POSITION_FIELDS
+    )
+
     # Feldbezeichnungen für die Kommunikation
     FIELD_CODES: Dict[str, str] = {
         "Laufende Nummer": "LaufendeNummer",
@@ -82,11 +99,9 @@ class Config:
     }
     
     @classmethod
-    def get_all_fields(cls) -> list:
+    def get_all_fields(cls) -> tuple:
         """Gibt alle Felder in der korrekten Reihenfolge zurück"""
-        return (cls.BASIC_FIELDS + cls.DIMENSION_FIELDS +
-                cls.PCB_FIELDS + cls.AF_FIELDS + cls.EXTRA_FIELDS +
-                cls.POSITION_FIELDS)
+        return cls.ALL_FIELDS
 
     @classmethod
     def get_field_code(cls, field: str) -> str:
@@ -95,7 +110,10 @@ class Config:
         Falls keine explizite Abkürzung vorhanden ist, wird eine generische
         Variante (Großbuchstaben ohne Sonderzeichen) zurückgegeben.
         """
-        return cls.FIELD_CODES.get(field, re.sub(r"\W+", "", field).upper())
+        code = cls.FIELD_CODES.get(field)
+        if code is None:
+            code = _generic_field_code(field)
+        return code
     
     # LIMA-Kommandos
     LIMA_COMMANDS = {
@@ -111,11 +129,19 @@ class Config:
         "af_origin_y": '<LIMA CMD="Project_GetNode" DIR="Request" PATH="Module Application.Smart Camera.Auto Focus Box.Origin.Y" />',
         "af_origin_z": '<LIMA CMD="Project_GetNode" DIR="Request" PATH="Module Application.Smart Camera.Auto Focus Box.Origin.Z" />'
     }
+
+    # Vorkodierte Kommandos inkl. Newline (spart encode() pro Aufruf)
+    LIMA_COMMANDS_BYTES = {
+        key: (command + "\n").encode("utf-8") for key, command in LIMA_COMMANDS.items()
+    }
     
     # Timeout-Einstellungen
     SOCKET_TIMEOUT = 3.0
     LISTENER_TIMEOUT = 1.0
     
+    # Socket-Puffergröße (SO_SNDBUF/SO_RCVBUF) in Bytes
+    SOCKET_BUFFER_SIZE = 262144
+    
     # Logging-Konfiguration
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     LOG_LEVEL = 'INFO'
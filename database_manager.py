@@ -3,37 +3,132 @@ Datenbankmanagement für den THT-Produktmanager
 """
 import sqlite3
 import logging
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import groupby
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from config import Config
 from exceptions import DatabaseError, ValidationError
 from validation import Validator
 
 logger = logging.getLogger(__name__)
 
+# Einmalig pro Verbindung gesetzt: WAL statt Rollback-Journal, kein fsync pro
+# Commit (WAL bleibt dabei konsistent), temporäre Daten im Speicher, ~20 MB Cache
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+# Maximale Anzahl zwischengespeicherter Produktsuchen (WU-Nummer -> Zeile)
+_LOOKUP_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=64)
+def _build_insert_sql(keys: tuple) -> str:
+    """INSERT-Statement für eine Spaltenfolge
+
+    Gleicher SQL-Text erlaubt sqlite3, das vorbereitete Statement der
+    persistenten Verbindung wiederzuverwenden.
+    """
+    columns = ', '.join(f'"{k}"' for k in keys)
+    placeholders = ', '.join('?' * len(keys))
+    return f'INSERT INTO produkte ({columns}) VALUES ({placeholders})'
+
+
+@lru_cache(maxsize=64)
+def _build_update_sql(keys: tuple) -> str:
+    """UPDATE-Statement für eine Spaltenfolge, gefiltert nach Laufender Nummer"""
+    setstr = ', '.join(f'"{k}"=?' for k in keys)
+    return f'UPDATE produkte SET {setstr} WHERE "Laufende Nummer"=?'
+
+
+# Spalten der Produktsuche: Config.ALL_FIELDS in dieser Reihenfolge, dazu
+# "AF Ursprung" (Tabellenspalte ohne eigenen Eintrag in Config.ALL_FIELDS)
+_LOOKUP_COLUMNS = Config.ALL_FIELDS + ("AF Ursprung",)
+
+# Produktsuche per WU-Nummer mit expliziter Spaltenliste statt SELECT *
+_LOOKUP_BY_WU_SQL = (
+    'SELECT ' + ', '.join(f'"{field}"' for field in _LOOKUP_COLUMNS) +
+    ' FROM produkte WHERE "Produktnummer"=?'
+)
+
+# Felder, die save_position beschreiben darf (Positionen, PCB- und AF-Messwerte)
+_SAVE_POSITION_FIELDS = frozenset(
+    Config.POSITION_FIELDS + Config.PCB_FIELDS + Config.AF_FIELDS
+)
+
+# Bedingte UPDATE-Statements je zulässigem Feld (Feldname wird nie ungeprüft
+# in SQL eingesetzt)
+_SAVE_POSITION_SQL = {
+    field: (
+        f'UPDATE produkte SET "{field}"=? WHERE "Laufende Nummer"=? '
+        f'AND ("{field}" IS NULL OR TRIM("{field}", char(32, 9, 10, 13))=\'\')'
+    )
+    for field in _SAVE_POSITION_FIELDS
+}
+
 class DatabaseManager:
-    """Verwaltet alle Datenbankoperationen"""
+    """Verwaltet alle Datenbankoperationen
+
+    Es wird eine langlebige Verbindung genutzt; Zugriffe aus mehreren Threads
+    werden über ein RLock serialisiert.
+    """
     
     def __init__(self, db_file: str = Config.DB_FILE):
         self.db_file = db_file
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # LRU-Cache für lookup_product_by_wu; wird bei jeder Änderung geleert
+        self._lookup_cache: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
         self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Liefert die persistente Verbindung und öffnet sie bei Bedarf"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
     
     @contextmanager
     def get_connection(self):
-        """Context Manager für Datenbankverbindungen"""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            yield conn
-        except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Datenbankfehler: {e}")
-            raise DatabaseError(f"Datenbankfehler: {e}")
-        finally:
-            if conn:
-                conn.close()
+        """Context Manager für Datenbankzugriffe über die persistente Verbindung
+
+        Nicht committete Änderungen werden am Ende verworfen, damit keine
+        offene Transaktion in der nächsten Operation weiterlebt.
+        """
+        with self._lock:
+            conn = None
+            changes = 0
+            try:
+                conn = self._connect()
+                changes = conn.total_changes
+                yield conn
+            except sqlite3.Error as e:
+                logger.error("Datenbankfehler: %s", e)
+                raise DatabaseError(f"Datenbankfehler: {e}")
+            finally:
+                if conn is not None:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    if conn.total_changes != changes:
+                        self._lookup_cache.clear()
+
+    def close(self) -> None:
+        """Schließt die persistente Verbindung"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
     
     def init_database(self) -> None:
         """Initialisiert die Datenbank mit allen erforderlichen Feldern"""
@@ -47,6 +142,12 @@ class DatabaseManager:
                 # Position-Felder hinzufügen (falls noch nicht vorhanden)
                 self._add_position_fields(c)
                 
+                # Index für die Produktsuche per WU-Nummer (Listener)
+                c.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_produkte_produktnummer '
+                    'ON produkte("Produktnummer")'
+                )
+                
                 conn.commit()
                 logger.info("Datenbank erfolgreich initialisiert")
         
@@ -104,21 +205,23 @@ class DatabaseManager:
             logger.error(f"Fehler beim Laden der Produkte: {e}")
             raise DatabaseError(f"Produkte konnten nicht geladen werden: {e}")
     
+    @staticmethod
+    def _validate_laufnummer(data: Dict[str, Any]) -> None:
+        """Prüft die Laufende Nummer eines Datensatzes (falls angegeben)"""
+        if "Laufende Nummer" in data:
+            Validator.validate_required_field(str(data["Laufende Nummer"]), "Laufende Nummer")
+            if not Validator.validate_laufnummer(str(data["Laufende Nummer"])):
+                raise ValidationError("Ungültige Laufende Nummer")
+    
     def insert_product(self, data: Dict[str, Any]) -> None:
         """Fügt ein neues Produkt hinzu"""
         try:
             # Validierung
-            if "Laufende Nummer" in data:
-                Validator.validate_required_field(str(data["Laufende Nummer"]), "Laufende Nummer")
-                if not Validator.validate_laufnummer(str(data["Laufende Nummer"])):
-                    raise ValidationError("Ungültige Laufende Nummer")
+            self._validate_laufnummer(data)
             
             with self.get_connection() as conn:
                 c = conn.cursor()
-                columns = ', '.join([f'"{k}"' for k in data.keys()])
-                placeholders = ', '.join(['?'] * len(data))
-                sql = f'INSERT INTO produkte ({columns}) VALUES ({placeholders})'
-                c.execute(sql, list(data.values()))
+                c.execute(_build_insert_sql(tuple(data)), tuple(data.values()))
                 conn.commit()
                 logger.info(f"Produkt {data.get('Laufende Nummer')} eingefügt")
         
@@ -126,15 +229,41 @@ class DatabaseManager:
             logger.error(f"Fehler beim Einfügen des Produkts: {e}")
             raise DatabaseError(f"Produkt konnte nicht eingefügt werden: {e}")
     
+    def insert_products(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Fügt mehrere Produkte in einer Transaktion ein
+
+        Aufeinanderfolgende Zeilen mit gleichen Spalten werden per executemany
+        mit einem vorbereiteten Statement eingefügt. ``rows`` darf ein Generator
+        sein. Schlägt eine Zeile fehl, wird nichts übernommen.
+        """
+        inserted = 0
+
+        def values(group: Iterable[Dict[str, Any]]) -> Iterator[tuple]:
+            nonlocal inserted
+            for data in group:
+                self._validate_laufnummer(data)
+                inserted += 1
+                yield tuple(data.values())
+
+        try:
+            with self.get_connection() as conn:
+                c = conn.cursor()
+                for keys, group in groupby(rows, key=tuple):
+                    c.executemany(_build_insert_sql(keys), values(group))
+                conn.commit()
+                logger.info("%d Produkte eingefügt", inserted)
+                return inserted
+        
+        except Exception as e:
+            logger.error("Fehler beim Einfügen der Produkte: %s", e)
+            raise DatabaseError(f"Produkte konnten nicht eingefügt werden: {e}")
+    
     def update_product(self, laufende_nummer: int, data: Dict[str, Any]) -> None:
         """Aktualisiert ein vorhandenes Produkt"""
         try:
             with self.get_connection() as conn:
                 c = conn.cursor()
-                setstr = ', '.join([f'"{k}"=?' for k in data.keys()])
-                values = list(data.values()) + [laufende_nummer]
-                sql = f'UPDATE produkte SET {setstr} WHERE "Laufende Nummer"=?'
-                c.execute(sql, values)
+                c.execute(_build_update_sql(tuple(data)), (*data.values(), laufende_nummer))
                 conn.commit()
                 logger.info(f"Produkt {laufende_nummer} aktualisiert")
         
@@ -156,12 +285,24 @@ class DatabaseManager:
             raise DatabaseError(f"Produkt konnte nicht gelöscht werden: {e}")
     
     def lookup_product_by_wu(self, wu_nummer: str) -> Optional[Dict[str, Any]]:
-        """Sucht Produkt nach WU-Nummer"""
+        """Sucht Produkt nach WU-Nummer
+
+        Liefert die Felder aus Config.ALL_FIELDS und "AF Ursprung". Ergebnisse
+        werden zwischengespeichert, bis sich die Datenbank ändert.
+        """
         try:
             with self.get_connection() as conn:
-                c = conn.cursor()
-                c.execute('SELECT * FROM produkte WHERE "Produktnummer"=?', (wu_nummer,))
-                row = c.fetchone()
+                cache = self._lookup_cache
+                if wu_nummer in cache:
+                    cache.move_to_end(wu_nummer)
+                    row = cache[wu_nummer]
+                else:
+                    row = conn.execute(_LOOKUP_BY_WU_SQL, (wu_nummer,)).fetchone()
+                    row = dict(row) if row else None
+                    cache[wu_nummer] = row
+                    if len(cache) > _LOOKUP_CACHE_SIZE:
+                        cache.popitem(last=False)
+                # Kopie, damit Aufrufer den Cache-Eintrag nicht verändern
                 return dict(row) if row else None
 
         except Exception as e:
@@ -173,22 +314,26 @@ class DatabaseManager:
         return self.lookup_product_by_wu(wu)
     
     def save_position(self, laufende_nummer: int, field: str, value: str) -> bool:
-        """Speichert Position für ein Produkt"""
+        """Speichert Position für ein Produkt, sofern das Feld noch leer ist"""
+        sql = _SAVE_POSITION_SQL.get(field)
+        if sql is None:
+            raise ValidationError(f"Ungültiges Feld für save_position: {field}")
+
         try:
             with self.get_connection() as conn:
-                c = conn.cursor()
-                
-                # Prüfen ob bereits ein Wert vorhanden ist
-                c.execute(f'SELECT "{field}" FROM produkte WHERE "Laufende Nummer"=?', (laufende_nummer,))
-                existing = c.fetchone()
-                
-                if existing and existing[0] and existing[0].strip():
-                    logger.warning(f"Feld '{field}' für Produkt {laufende_nummer} bereits gesetzt")
-                    return False
-                
-                # Wert speichern
-                c.execute(f'UPDATE produkte SET "{field}"=? WHERE "Laufende Nummer"=?', (value, laufende_nummer))
+                # Prüfung und Schreiben in einer Anweisung
+                c = conn.execute(sql, (value, laufende_nummer))
                 conn.commit()
+                if c.rowcount != 1:
+                    exists = conn.execute(
+                        'SELECT 1 FROM produkte WHERE "Laufende Nummer"=?', (laufende_nummer,)
+                    ).fetchone()
+                    if exists:
+                        logger.warning(f"Feld '{field}' für Produkt {laufende_nummer} bereits gesetzt")
+                        return False
+                    # Wie bisher: fehlendes Produkt gilt nicht als Konflikt
+                    logger.warning(f"Produkt {laufende_nummer} nicht vorhanden, Position {field} nicht gespeichert")
+                    return True
                 logger.info(f"Position {field} für Produkt {laufende_nummer} gespeichert")
                 return True
         
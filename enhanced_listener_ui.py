@@ -3,10 +3,31 @@ Erweiterte UI-Komponenten für Listener-Mode mit Nachrichtenverfolgung
 """
 import customtkinter as ctk
 import tkinter as tk
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
+import threading
 import time
 from datetime import datetime
 
+from config import Config
+
+# Intervall für das gesammelte Einfügen neuer Log-Zeilen (ms)
+LOG_FLUSH_INTERVAL_MS = 100
+# Zeilen pro Abschnitt beim Exportieren des Logs
+EXPORT_CHUNK_LINES = 1000
+
+_ICON_MAP = {
+    "MESSAGE_RECEIVED": "⬇️",
+    "MESSAGE_SENT": "⬆️",
+    "RESPONSE_SENT": "↗️",
+    "RESPONSE_RECEIVED": "↙️",
+    "LISTENER_STARTED": "🟢",
+    "LISTENER_STOPPED": "🔴",
+    "CLIENT_ERROR": "❌",
+    "SEND_ERROR": "❌",
+    "SYSTEM": "ℹ️"
+}
+
 
 class ListenerLogWindow(ctk.CTkToplevel):
     """Separates Fenster für Listener-Logs mit erweiterter Anzeige"""
@@ -32,9 +53,16 @@ class ListenerLogWindow(ctk.CTkToplevel):
         # Automatisch scrollen
         self.auto_scroll = True
 
+        # Noch nicht angezeigte Log-Zeilen (werden gesammelt eingefügt)
+        self._pending: Deque[str] = deque()
+        self._pending_lock = threading.Lock()
+
         # Update-Timer starten
         self.update_timer_running = True
         self.after(100, self.update_display)
+        self._flush_after_id: Optional[str] = self.after(
+            LOG_FLUSH_INTERVAL_MS, self.flush_log_entries
+        )
 
     def on_window_close(self):
         """Wird aufgerufen wenn Fenster geschlossen wird"""
@@ -44,6 +72,7 @@ class ListenerLogWindow(ctk.CTkToplevel):
     def stop_listener(self):
         """Stoppt den Listener und schließt das Fenster"""
         self.update_timer_running = False  # Timer stoppen
+        self._cancel_flush()
         if hasattr(self.parent_app, '_stop_listener_mode'):
             self.parent_app._stop_listener_mode()
         else:
@@ -148,6 +177,8 @@ class ListenerLogWindow(ctk.CTkToplevel):
     
     def clear_log(self):
         """Löscht das Log"""
+        with self._pending_lock:
+            self._pending.clear()
         self.log_text.delete("1.0", "end")
         # Log im Listener-Mode löschen
         if hasattr(self.parent_app, 'listener_mode') and self.parent_app.listener_mode:
@@ -159,12 +190,15 @@ class ListenerLogWindow(ctk.CTkToplevel):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"listener_log_{timestamp}.txt"
             
-            content = self.log_text.get("1.0", "end")
-            
-            with open(filename, 'w', encoding='utf-8') as f:
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
                 f.write(f"Listener Log Export - {datetime.now()}\n")
                 f.write("=" * 50 + "\n\n")
-                f.write(content)
+                # Abschnittsweise auslesen statt das gesamte Log als einen String
+                start = "1.0"
+                while self.log_text.compare(start, "<", "end"):
+                    stop = self.log_text.index(f"{start} + {EXPORT_CHUNK_LINES} lines")
+                    f.write(self.log_text.get(start, stop))
+                    start = stop
             
             # Erfolg-Message
             success_msg = ctk.CTkInputDialog(
@@ -180,52 +214,68 @@ class ListenerLogWindow(ctk.CTkToplevel):
             )
     
     def add_log_entry(self, event: Dict[str, Any]):
-        """Fügt einen Log-Eintrag hinzu - Thread-sicher"""
+        """Merkt einen Log-Eintrag zur Anzeige vor - Thread-sicher"""
+        timestamp = event.get('timestamp', '')
+        event_type = event.get('type', 'UNKNOWN')
+        message = event.get('message', '')
+        source = event.get('source', '')
+
+        icon = _ICON_MAP.get(event_type, "📝")
+
+        log_line = f"{timestamp} {icon} [{event_type}] {source}: {message}\n"
+
+        with self._pending_lock:
+            self._pending.append(log_line)
+
+    def flush_log_entries(self):
+        """Fügt alle vorgemerkten Log-Zeilen mit einem einzigen insert() ein"""
+        self._flush_after_id = None
+        if not self.update_timer_running or not self.winfo_exists():
+            return
+
         try:
-            if not self.winfo_exists():
-                return
+            with self._pending_lock:
+                batch = "".join(self._pending)
+                self._pending.clear()
 
-            color_map = {
-                "MESSAGE_RECEIVED": "lightblue",
-                "MESSAGE_SENT": "lightgreen",
-                "RESPONSE_SENT": "lightcyan",
-                "RESPONSE_RECEIVED": "lightyellow",
-                "LISTENER_STARTED": "lightgray",
-                "LISTENER_STOPPED": "lightgray",
-                "CLIENT_ERROR": "lightcoral",
-                "SEND_ERROR": "lightcoral",
-                "SYSTEM": "lightgray"
-            }
-
-            icon_map = {
-                "MESSAGE_RECEIVED": "⬇️",
-                "MESSAGE_SENT": "⬆️",
-                "RESPONSE_SENT": "↗️",
-                "RESPONSE_RECEIVED": "↙️",
-                "LISTENER_STARTED": "🟢",
-                "LISTENER_STOPPED": "🔴",
-                "CLIENT_ERROR": "❌",
-                "SEND_ERROR": "❌",
-                "SYSTEM": "ℹ️"
-            }
-
-            timestamp = event.get('timestamp', '')
-            event_type = event.get('type', 'UNKNOWN')
-            message = event.get('message', '')
-            source = event.get('source', '')
-
-            icon = icon_map.get(event_type, "📝")
-
-            log_line = f"{timestamp} {icon} [{event_type}] {source}: {message}\n"
-
-            self.log_text.insert("end", log_line)
-
-            if self.auto_scroll:
-                self.log_text.see("end")
+            if batch:
+                self.log_text.insert("end", batch)
+                self._trim_log()
+                if self.auto_scroll:
+                    self.log_text.see("end")
 
         except Exception as e:
             print(f"Fehler beim Hinzufügen des Log-Eintrags: {e}")
-    
+
+        finally:
+            # Auch nach einem Fehler weiter einfügen
+            self._flush_after_id = self.after(
+                LOG_FLUSH_INTERVAL_MS, self.flush_log_entries
+            )
+
+    def _cancel_flush(self):
+        """Bricht den geplanten flush_log_entries-Aufruf ab"""
+        if self._flush_after_id is not None:
+            try:
+                self.after_cancel(self._flush_after_id)
+            except Exception:
+                pass
+            self._flush_after_id = None
+
+    def destroy(self):
+        """Stoppt die Timer, bevor das Fenster zerstört wird"""
+        self.update_timer_running = False
+        self._cancel_flush()
+        super().destroy()
+
+    def _trim_log(self):
+        """Entfernt die ältesten Zeilen oberhalb von LISTENER_LOG_MAX_LINES"""
+        max_lines = Config.LISTENER_LOG_MAX_LINES
+        # Jede Zeile endet mit "\n", "end-1c" steht daher hinter der letzten Zeile
+        line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if line_count > max_lines:
+            self.log_text.delete("1.0", f"{line_count - max_lines + 1}.0")
+
     def update_display(self):
         """Aktualisiert die Anzeige periodisch"""
         try:
@@ -233,6 +283,11 @@ class ListenerLogWindow(ctk.CTkToplevel):
             if not self.update_timer_running or not self.winfo_exists():
                 return
 
+            # Minimiertes/verdecktes Fenster: Labels nicht neu konfigurieren
+            if not self.winfo_viewable():
+                self.after(1000, self.update_display)
+                return
+
             # Laufzeit aktualisieren
             if hasattr(self.parent_app, 'listener_start_time') and self.parent_app.listener_start_time:
                 elapsed = int(time.time() - self.parent_app.listener_start_time)
@@ -245,7 +300,7 @@ class ListenerLogWindow(ctk.CTkToplevel):
 
             # Statistik aktualisieren
             if hasattr(self.parent_app, 'listener_mode') and self.parent_app.listener_mode:
-                log_count = len(self.parent_app.listener_mode.get_message_log())
+                log_count = self.parent_app.listener_mode.message_count
                 self.stats_label.configure(text=f"Nachrichten: {log_count}")
 
             # Nächstes Update planen - nur wenn Timer noch läuft
@@ -1,9 +1,13 @@
 import re
 import socket
 import logging
-from typing import Optional, List, Callable
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Optional, Callable, Dict, Sequence, Tuple
 
 from database_manager import DatabaseManager
+from communication_manager import open_connection
 from config import Config
 
 # Unterstützt Produktnummern im Format "WU123", "WUBRE123" sowie
@@ -12,12 +16,24 @@ from config import Config
 PRODUCT_RE = re.compile(r"\b(?:WU|WUBRE)-?\d+[A-Z]*\b", re.IGNORECASE)
 # Rückwärtskompatibler Alias
 WU_RE = PRODUCT_RE
+# Gebundene Methode spart das Attribut-Lookup pro Aufruf
+_WU_SEARCH = PRODUCT_RE.search
+# Vorfilter: "WU" in beliebiger Schreibweise, ohne Kopie des Payloads
+_WU_HINT = re.compile("wu", re.IGNORECASE).search
 
 
 def _extract_wu(payload: str) -> Optional[str]:
     """Extrahiert eine Produktnummer (WU/WUBRE) aus dem Payload."""
-    m = WU_RE.search(payload or "")
-    return m.group(0) if m else None
+    # Vorfilter erspart die vollständige Regex bei Nachrichten ohne "WU"
+    if not payload or not _WU_HINT(payload):
+        return None
+    m = _WU_SEARCH(payload)
+    return m[0] if m else None
+
+
+# Abschluss jeder Antwort an den Cobot und feste Antwort für unbekannte WU-Nummern
+_MESSAGE_END = "END"
+_NOT_FOUND_MESSAGE = "NichtVorhanden" + _MESSAGE_END
 
 
 def _get_product_row_by_wu(db: DatabaseManager, wu: str) -> Optional[dict]:
@@ -25,32 +41,138 @@ def _get_product_row_by_wu(db: DatabaseManager, wu: str) -> Optional[dict]:
     return db.get_by_wu(wu)
 
 
-def _format_row_as_underscore_string(row: dict, fields: List[str] | None = None) -> str:
-    """Formatiert eine Datenbankzeile als "KEY:WERT"-Paare."""
+_UNDERSCORE_TRANS = str.maketrans("_", "-")
+# Freitextfelder, in denen "_" vorkommen kann; alle anderen Werte (Nummern,
+# Messwerte, Positionen, Zeitstempel) werden unverändert gesendet
+_FREE_TEXT_FIELDS = frozenset({"Kunde", "Notizen"})
+
+
+@lru_cache(maxsize=16)
+def _field_layout(fields: Tuple[str, ...]) -> Tuple[str, Callable[[Any], tuple], int]:
+    """Liefert (Formatvorlage "CODE:{}_...", Werte-Getter, Anzahl "_" ohne Werte) je Feldreihenfolge."""
+    template = "_".join(
+        Config.get_field_code(field).replace("{", "{{").replace("}", "}}") + ":{}"
+        for field in fields
+    )
+    underscores = template.count("_")
+    if len(fields) == 1:
+        field = fields[0]
+        return template, lambda row: (row[field],), underscores
+    getter = itemgetter(*fields) if fields else (lambda row: ())
+    return template, getter, underscores
+
+
+def _format_row_as_underscore_string(row: dict, fields: Sequence[str] | None = None) -> str:
+    """Formatiert eine Datenbankzeile als "KEY:WERT"-Paare.
+
+    "_" trennt die Paare; in Freitextfeldern wird es daher durch "-" ersetzt.
+    """
     if not row:
         return ""
 
-    field_order = fields if fields is not None else Config.get_all_fields()
-    parts: List[str] = []
-    for field in field_order:
-        code = Config.get_field_code(field)
-        val = str(row.get(field, ""))
-        parts.append(f"{code}:{val}")
-    return "_".join(parts)
+    field_order = tuple(fields) if fields is not None else Config.get_all_fields()
+    template, getter, underscores = _field_layout(field_order)
+    try:
+        # {} entspricht str(value), auch für None
+        message = template.format(*getter(row))
+        # Keine zusätzlichen "_" -> kein Wert enthält einen Unterstrich
+        if message.count("_") == underscores:
+            return message
+    except KeyError:
+        pass
+    # Unterstriche in Freitextfeldern ersetzen, fehlende Felder als Leerstring
+    return template.format(*[
+        str(row.get(field, "")).translate(_UNDERSCORE_TRANS)
+        if field in _FREE_TEXT_FIELDS else row.get(field, "")
+        for field in field_order
+    ])
+
+
+class CobotSender:
+    """Persistente Verbindung für Listener-Antworten an den Cobot.
+
+    Die Verbindung wird beim ersten Senden aufgebaut und weiterverwendet. Ist
+    eine wiederverwendete Verbindung inzwischen geschlossen, wird genau einmal
+    neu verbunden. Nachrichten ohne 'OK'-Abfrage laufen über eine eigene
+    Verbindung, damit ihr ungelesenes 'OK' nicht der nächsten Nachricht
+    zugeordnet wird.
+    """
+
+    def __init__(self, ip: str, port: int, timeout: float = 5.0):
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def send(self, message: str, read_ok: bool = True) -> bool:
+        """Sendet eine Nachricht und wartet optional auf ein 'OK'."""
+        payload = message.encode("utf-8") + b"\n"
+        if not read_ok:
+            with open_connection(self.ip, self.port, self.timeout) as sock:
+                sock.sendall(payload)
+            return True
+        with self._lock:
+            for attempt in range(2):
+                reused = self._sock is not None
+                try:
+                    if self._sock is None:
+                        self._sock = open_connection(self.ip, self.port, self.timeout)
+                    self._sock.sendall(payload)
+                    data = self._sock.recv(4096)
+                    if not data:
+                        raise ConnectionError("Verbindung vom Cobot geschlossen")
+                    return data.strip() == b"OK"
+                except socket.timeout:
+                    # Eine verspätete Antwort darf nicht der nächsten Nachricht zugeordnet werden
+                    self._close()
+                    return False
+                except OSError:
+                    self._close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+        return False
+
+    def close(self) -> None:
+        """Schließt die Verbindung."""
+        with self._lock:
+            self._close()
+
+
+_senders: Dict[Tuple[str, int], CobotSender] = {}
+_senders_lock = threading.Lock()
+
+
+def _get_sender(ip: str, port: int, timeout: float) -> CobotSender:
+    """Liefert den (gemeinsam genutzten) CobotSender für ein Ziel."""
+    with _senders_lock:
+        sender = _senders.get((ip, port))
+        if sender is None:
+            sender = _senders[(ip, port)] = CobotSender(ip, port, timeout)
+        return sender
+
+
+def close_cobot_senders() -> None:
+    """Schließt alle gemeinsam genutzten Cobot-Verbindungen."""
+    with _senders_lock:
+        senders = list(_senders.values())
+        _senders.clear()
+    for sender in senders:
+        sender.close()
 
 
 def _send_to_cobot(ip: str, port: int, message: str, read_ok: bool = True, timeout: float = 5.0) -> bool:
     """Sendet eine Nachricht an den Cobot und wartet optional auf ein 'OK'."""
-    with socket.create_connection((ip, port), timeout=timeout) as s:
-        s.sendall((message + "\n").encode("utf-8"))
-        if not read_ok:
-            return True
-        s.settimeout(timeout)
-        try:
-            resp = s.recv(4096).decode("utf-8", errors="ignore").strip()
-            return resp == "OK"
-        except Exception:
-            return False
+    return _get_sender(ip, port, timeout).send(message, read_ok)
 
 
 def handle_listener_payload(payload: str, db: DatabaseManager, send_ip: str, send_port: int,
@@ -68,16 +190,15 @@ def handle_listener_payload(payload: str, db: DatabaseManager, send_ip: str, sen
     """
     wu = _extract_wu(payload)
     if not wu:
-        logger.info(f"Keine WU-Nummer erkannt in: {payload}")
+        logger.info("Keine WU-Nummer erkannt in: %s", payload)
         return
 
     row = _get_product_row_by_wu(db, wu)
     message = (
-        _format_row_as_underscore_string(row, Config.get_all_fields())
+        _format_row_as_underscore_string(row, Config.get_all_fields()) + _MESSAGE_END
         if row
-        else "NichtVorhanden"
+        else _NOT_FOUND_MESSAGE
     )
-    message += "END"
 
     # Gesendete Nachricht im Listener-Fenster anzeigen
     if log_event:
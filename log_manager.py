@@ -0,0 +1,92 @@
+"""
+Logging-Konfiguration für den THT-Produktmanager
+"""
+import logging
+import logging.handlers
+import os
+import queue
+
+from config import Config
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler mit gepuffertem Schreiben
+
+    Records unterhalb von flush_level bleiben im Dateipuffer, statt nach jedem
+    Record geschrieben zu werden; ab flush_level (und beim Schließen) wird
+    sofort geschrieben.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = 65536,
+                 flush_level: int = logging.WARNING, **kwargs):
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        super().__init__(filename, **kwargs)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+            else:
+                return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+# Logging konfigurieren
+def setup_logging() -> logging.handlers.QueueListener:
+    """Konfiguriert das Logging-System
+
+    Log-Aufrufe legen den Record nur in eine Queue; Datei- und Konsolenausgabe
+    übernimmt ein QueueListener-Thread. Beim Beenden muss stop_logging()
+    aufgerufen werden.
+    """
+    os.makedirs('logs', exist_ok=True)
+    
+    formatter = logging.Formatter(Config.LOG_FORMAT)
+    output_handlers = [
+        BufferedFileHandler(f'logs/{Config.LOG_FILE}'),
+        logging.StreamHandler()
+    ]
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Nur die Nachricht einsetzen; das Format wendet der Listener an
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(
+        log_queue, *output_handlers, respect_handler_level=True
+    )
+    listener.start()
+    
+    logging.basicConfig(
+        level=getattr(logging, Config.LOG_LEVEL),
+        handlers=[queue_handler],
+        # ur_tcp_position ruft beim Import bereits basicConfig auf
+        force=True
+    )
+    
+    # Weniger Logging für externe Bibliotheken
+    logging.getLogger('PIL').setLevel(logging.WARNING)
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+    
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener) -> None:
+    """Schreibt ausstehende Log-Records und schließt die Ausgabe-Handler"""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+        handler.close()
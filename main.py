@@ -9,6 +9,7 @@ import json
 import os
 import time
 from datetime import datetime
+from functools import cache, partial
 from typing import Optional, Dict, Any, List
 
 # Import der optimierten Module
@@ -21,40 +22,44 @@ from exceptions import (
 )
 from validation import Validator
 from database_manager import DatabaseManager
-from communication_manager import LimaClient, RobotCommunicator, ListenerMode
-from listener_processor import handle_listener_payload, WU_RE
+from communication_manager import LimaClient, RobotCommunicator, ListenerMode, is_json_object
+from listener_processor import handle_listener_payload, close_cobot_senders, WU_RE
 from ui_manager import FormManager, SidebarManager, StatusManager, MessageHandler
 from thread_manager import ThreadManager
-
-# Zusätzliche Imports für die Hauptdatei
-try:
-    from enhanced_listener_ui import ListenerLogWindow
-except ImportError as e:
-    print(f"Warnung: enhanced_listener_ui konnte nicht importiert werden: {e}")
-    ListenerLogWindow = None
-
+from log_manager import setup_logging, stop_logging
 
 # TCP POSITION
 from ur_tcp_position import get_tcp_position
-from rtde_one_shot import read_rtde_pose
-
-# Logging konfigurieren
-def setup_logging():
-    """Konfiguriert das Logging-System"""
-    os.makedirs('logs', exist_ok=True)
-    
-    logging.basicConfig(
-        level=getattr(logging, Config.LOG_LEVEL),
-        format=Config.LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(f'logs/{Config.LOG_FILE}'),
-            logging.StreamHandler()
-        ]
-    )
-    
-    # Weniger Logging für externe Bibliotheken
-    logging.getLogger('PIL').setLevel(logging.WARNING)
-    logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+
+# Erst beim ersten Gebrauch importiert (Listener-Fenster, RTDE), damit das
+# Hauptfenster schneller erscheint
+@cache
+def _get_listener_log_window():
+    """Liefert die Klasse ListenerLogWindow oder None, falls nicht importierbar"""
+    try:
+        from enhanced_listener_ui import ListenerLogWindow
+    except ImportError as e:
+        print(f"Warnung: enhanced_listener_ui konnte nicht importiert werden: {e}")
+        return None
+    return ListenerLogWindow
+
+
+# LIMA-Einstellung -> Eingabefeld im LIMA-Konfigurationspanel
+LIMA_ENTRY_ATTRS = {
+    "ip": "ip_entry",
+    "port": "port_entry",
+    "listener_port": "listener_port_entry",
+    "send_ip": "send_ip_entry",
+    "send_port": "send_port_entry",
+}
+
+# Listener-Kommandos: Nachrichtenanfang -> Aktion(app, Rest der Nachricht)
+LISTENER_COMMANDS = {
+    "LOAD_PRODUCT:": lambda app, arg: app._load_product_by_number(arg.strip()),
+    "GET_AF_VALUES": lambda app, arg: app._get_all_af_values(),
+    "TRIGGER": lambda app, arg: app._send_trigger(),
+}
 
 # Hauptanwendungsklasse
 class ProduktManagerApp(ctk.CTk):
@@ -64,7 +69,7 @@ class ProduktManagerApp(ctk.CTk):
         super().__init__()
         
         # Logging initialisieren
-        setup_logging()
+        self.log_listener = setup_logging()
         self.logger = logging.getLogger(__name__)
         self.logger.info("THT-Produktmanager wird gestartet...")
         
@@ -100,9 +105,8 @@ class ProduktManagerApp(ctk.CTk):
         # Daten laden
         self._load_initial_data()
 
-        # Verbindungen testen
-        # Verzögerung einbauen, damit die GUI zuerst erscheint
-        self.after(100, self._test_connections)
+        # LIMA-Clients werden erst bei der ersten Roboter-Aktion erstellt
+        # (siehe _ensure_clients), der Start blockiert nicht auf das Netzwerk
         
         self.logger.info("THT-Produktmanager erfolgreich gestartet")
     
@@ -143,8 +147,8 @@ class ProduktManagerApp(ctk.CTk):
         # Steuerungsbuttons erstellen
         self._create_control_buttons()
         
-        # LIMA-Konfigurationspanel
-        self._create_lima_config_panel()
+        # LIMA-Konfigurationspanel wird erst beim ersten Öffnen erstellt
+        self._lima_panel_built = False
     
     def _connect_sidebar_events(self):
         """Verbindet Sidebar-Events"""
@@ -171,29 +175,17 @@ class ProduktManagerApp(ctk.CTk):
         if "af_all_button" in form_widgets:
             form_widgets["af_all_button"].configure(command=self._get_all_af_values)
         
-        # PCB-Buttons
-        for field in Config.PCB_FIELDS:
-            btn_key = f"{field}_button"
-            if btn_key in form_widgets:
-                form_widgets[btn_key].configure(
-                    command=lambda f=field: self._autofocus_and_get_focus_value(f)
-                )
-        
-        # AF-Buttons
-        for field in Config.AF_FIELDS:
-            btn_key = f"{field}_button"
-            if btn_key in form_widgets:
-                form_widgets[btn_key].configure(
-                    command=lambda f=field: self._get_af_value(f)
-                )
-        
-        # Position-Buttons
-        for field in Config.POSITION_FIELDS:
-            btn_key = f"{field}_button"
-            if btn_key in form_widgets:
-                form_widgets[btn_key].configure(
-                    command=lambda f=field: self._handle_position_request(f)
-                )
+        # Feld-Buttons (PCB, AF, Position) -> Handler(field)
+        field_handlers = (
+            (Config.PCB_FIELDS, self._autofocus_and_get_focus_value),
+            (Config.AF_FIELDS, self._get_af_value),
+            (Config.POSITION_FIELDS, self._handle_position_request),
+        )
+        for fields, handler in field_handlers:
+            for field in fields:
+                btn_key = f"{field}_button"
+                if btn_key in form_widgets:
+                    form_widgets[btn_key].configure(command=partial(handler, field))
     
     def _create_control_buttons(self):
         """Erstellt Steuerungsbuttons"""
@@ -552,6 +544,10 @@ class ProduktManagerApp(ctk.CTk):
             }
             
             # Validierung
+            # Optionalen UDP-Port (nur in der Datei konfigurierbar) beibehalten
+            if "udp_port" in self.lima_config:
+                config["udp_port"] = self.lima_config["udp_port"]
+            
             Validator.validate_lima_config(config)
             
             with open(Config.LIMA_CONFIG_FILE, "w") as f:
@@ -573,10 +569,19 @@ class ProduktManagerApp(ctk.CTk):
     def _update_lima_clients(self):
         """Aktualisiert LIMA-Clients mit neuer Konfiguration"""
         try:
-            ip = self.ip_entry.get()
-            port = int(self.port_entry.get())
+            ip = self._lima_setting("ip")
+            port = int(self._lima_setting("port"))
+            # Optional: UDP-Port für idempotente Abfragen (Fokuswert, TCP-Pose)
+            udp_port = self.lima_config.get("udp_port")
             
-            self.lima_client = LimaClient(ip, port)
+            # Persistente Verbindung des alten Clients im Hintergrund freigeben
+            # (close() wartet ggf. auf den I/O-Thread)
+            if self.lima_client:
+                self.thread_manager.start_thread(self.lima_client.close, name="LimaClose")
+
+            self.lima_client = LimaClient(
+                ip, port, udp_port=int(udp_port) if udp_port else None
+            )
             self.robot_communicator = RobotCommunicator(self.lima_client)
             
         except Exception as e:
@@ -584,39 +589,65 @@ class ProduktManagerApp(ctk.CTk):
             self.lima_client = None
             self.robot_communicator = None
     
-    def _test_connections(self):
-        """Testet alle Verbindungen beim Start"""
-        self._update_lima_clients()
-        self._test_lima_connection()
+    def _ensure_clients(self) -> bool:
+        """Erstellt die LIMA-Clients bei Bedarf; True, falls verfügbar"""
+        if self.robot_communicator is None:
+            self._update_lima_clients()
+        return self.robot_communicator is not None
     
     def _test_lima_connection(self):
-        """Testet LIMA-Verbindung"""
-        if not self.lima_client:
-            self._update_lima_clients()
+        """Testet LIMA-Verbindung im Hintergrund
+
+        Das Ergebnis wird über after() im UI-Thread angezeigt.
+        """
+        if not self._ensure_clients():
+            return
+        
+        client = self.lima_client
         
-        if self.lima_client:
+        def probe():
             try:
-                connected = self.lima_client.test_connection()
-                self.status_manager.update_lima_status(connected)
-                
-                if hasattr(self, 'lima_status_label'):
-                    if connected:
-                        self.lima_status_label.configure(text="Status: 🟢 Verbunden", text_color="green")
-                    else:
-                        self.lima_status_label.configure(text="Status: 🔴 Getrennt", text_color="red")
-                
-                if connected:
-                    self.message_handler.show_info("Verbindung erfolgreich", "LIMA-Verbindung hergestellt")
-                else:
-                    self.message_handler.show_warning("Verbindung fehlgeschlagen", "LIMA nicht erreichbar")
-            
+                connected, error = client.test_connection(), None
             except CommunicationError as e:
-                self.message_handler.show_error("Verbindungsfehler", str(e))
-                self.status_manager.update_lima_status(False)
+                connected, error = False, str(e)
+            self.after(0, self._apply_connection_status, connected, error)
+        
+        self.thread_manager.start_thread(probe, name="LimaProbe")
+    
+    def _apply_connection_status(self, connected: bool, error: Optional[str]):
+        """Zeigt das Ergebnis des Verbindungstests an (UI-Thread)"""
+        self.status_manager.update_lima_status(connected)
+        
+        if error is None and hasattr(self, 'lima_status_label'):
+            if connected:
+                self.lima_status_label.configure(text="Status: 🟢 Verbunden", text_color="green")
+            else:
+                self.lima_status_label.configure(text="Status: 🔴 Getrennt", text_color="red")
+        
+        if error is not None:
+            self.message_handler.show_error("Verbindungsfehler", error)
+        elif connected:
+            self.message_handler.show_info("Verbindung erfolgreich", "LIMA-Verbindung hergestellt")
+        else:
+            self.message_handler.show_warning("Verbindung fehlgeschlagen", "LIMA nicht erreichbar")
+    
+    def _lima_setting(self, key: str) -> str:
+        """Aktueller Wert einer LIMA-Einstellung
+
+        Aus dem Eingabefeld, sobald das Panel erstellt ist, sonst aus der
+        geladenen Konfiguration.
+        """
+        if self._lima_panel_built:
+            return getattr(self, LIMA_ENTRY_ATTRS[key]).get()
+        return str(self.lima_config.get(key, Config.DEFAULT_LIMA_CONFIG[key]))
     
     def _toggle_lima_panel(self):
         """Zeigt/Versteckt LIMA-Konfigurationspanel"""
-        if self.lima_panel.winfo_ismapped():
+        if not self._lima_panel_built:
+            self._create_lima_config_panel()
+            self._lima_panel_built = True
+            self.lima_panel.grid()
+        elif self.lima_panel.winfo_ismapped():
             self.lima_panel.grid_remove()
         else:
             self.lima_panel.grid()
@@ -625,7 +656,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _start_autofocus(self):
         """Startet Autofokus"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -641,7 +672,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _send_trigger(self):
         """Sendet Trigger-Signal"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -657,7 +688,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _autofocus_and_get_focus_value(self, field: str):
         """Startet Autofokus und holt anschließend den Fokuswert"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -687,7 +718,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _get_af_value(self, field: str):
         """Holt AF-Wert"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -705,7 +736,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _get_af_origin_xyz(self):
         """Holt AF-Ursprung XYZ-Koordinaten"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -750,7 +781,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _get_all_af_values(self):
         """Holt alle AF-Werte auf einmal"""
-        if not self.robot_communicator:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -772,7 +803,7 @@ class ProduktManagerApp(ctk.CTk):
 
     def _get_tcp_pose_via_ur(self):
         """Ruft die TCP-Pose direkt vom UR-Roboter ab"""
-        ip = self.send_ip_entry.get().strip() if hasattr(self, "send_ip_entry") else ""
+        ip = self._lima_setting("send_ip").strip()
         if not ip:
             self.message_handler.show_warning("Hinweis", "Bitte Cobot-IP eintragen")
             return None
@@ -804,11 +835,12 @@ class ProduktManagerApp(ctk.CTk):
                 self.message_handler.show_warning("Hinweis", "Kein Produkt ausgewählt.")
                 return
 
-            robot_ip = self.send_ip_entry.get().strip()
+            robot_ip = self._lima_setting("send_ip").strip()
             if not robot_ip:
                 self.message_handler.show_warning("Hinweis", "Bitte Cobot IP (Send) setzen.")
                 return
 
+            from rtde_one_shot import read_rtde_pose
             x, y, z, rx, ry, rz = read_rtde_pose(robot_ip, timeout=1.0)
             p_str = f"p[{x:.6f}, {y:.6f}, {z:.6f}, {rx:.6f}, {ry:.6f}, {rz:.6f}]"
 
@@ -834,7 +866,7 @@ class ProduktManagerApp(ctk.CTk):
     
     def _get_lima_info(self):
         """Holt Produktinformationen von LIMA"""
-        if not self.lima_client:
+        if not self._ensure_clients():
             self.message_handler.show_error("Fehler", "LIMA-Verbindung nicht verfügbar")
             return
         
@@ -846,7 +878,14 @@ class ProduktManagerApp(ctk.CTk):
         
         def task():
             try:
-                product_info = self.lima_client.get_product_info(product_number)
+                info = self.lima_client.get_product_info(product_number)
+                # Nur Formularfelder im Worker-Thread auslesen (lazy Parsing);
+                # JSON-Listen, Zahlen oder Strings enthalten keine Felder
+                product_info = {
+                    field: info[field]
+                    for field in self.form_manager.entries
+                    if field in info
+                } if is_json_object(info) else {}
                 if product_info:
                     # Produktinformationen in Formular setzen
                     self.after(0, lambda: self._set_lima_product_info(product_info))
@@ -893,7 +932,7 @@ class ProduktManagerApp(ctk.CTk):
                 if not self.admin_mode and hasattr(entry, 'configure'):
                     entry.configure(state="disabled")
                 
-                self.logger.debug(f"Feld {field} auf {value} gesetzt")
+                self.logger.debug("Feld %s auf %s gesetzt", field, value)
         
         except Exception as e:
             self.logger.error(f"Fehler beim Aktualisieren des Feldes {field}: {e}")
@@ -908,12 +947,10 @@ class ProduktManagerApp(ctk.CTk):
 
         try:
             # Listener-Konfiguration
-            send_ip = self.send_ip_entry.get().strip()
-            send_port = int(self.send_port_entry.get().strip())
-            camera_ip = self.ip_entry.get().strip() if hasattr(self, "ip_entry") else self.lima_config.get(
-                "ip", Config.DEFAULT_LIMA_CONFIG["ip"]
-            )
-            camera_port = int(self.listener_port_entry.get().strip())
+            send_ip = self._lima_setting("send_ip").strip()
+            send_port = int(self._lima_setting("send_port").strip())
+            camera_ip = self._lima_setting("ip").strip()
+            camera_port = int(self._lima_setting("listener_port").strip())
 
             # Listener-Modus starten mit BEIDEN Callbacks
             self.listener_mode = ListenerMode(
@@ -959,6 +996,7 @@ class ProduktManagerApp(ctk.CTk):
                     pass
 
             # Import prüfen
+            ListenerLogWindow = _get_listener_log_window()
             if ListenerLogWindow is None:
                 self.logger.error("ListenerLogWindow nicht verfügbar - verwende Fallback")
                 self._show_listener_popup()  # Fallback zur alten Popup-Methode
@@ -1004,6 +1042,9 @@ class ProduktManagerApp(ctk.CTk):
             self.listener_mode.stop()
             self.listener_mode = None
 
+        # Gemeinsam genutzte Verbindungen für Antworten an den Cobot schließen
+        close_cobot_senders()
+
         # Log-Fenster schließen
         if hasattr(self, 'listener_log_window') and self.listener_log_window:
             try:
@@ -1079,19 +1120,14 @@ class ProduktManagerApp(ctk.CTk):
                     self.listener_mode._log_event,
                 )
 
-            # Zusätzliche Befehle verarbeiten
-            if message.startswith("LOAD_PRODUCT:"):
-                product_number = message.split(":", 1)[1].strip()
-                self.after(0, lambda: self._load_product_by_number(product_number))
-
-            elif message.startswith("GET_AF_VALUES"):
-                self.after(0, lambda: self._get_all_af_values())
-
-            elif message.startswith("TRIGGER"):
-                self.after(0, lambda: self._send_trigger())
-
-            elif not WU_RE.search(message):
-                self.logger.warning(f"Unbekannte Listener-Nachricht: {message}")
+            # Zusätzliche Befehle verarbeiten (Präfixvergleich wie startswith)
+            for prefix, command in LISTENER_COMMANDS.items():
+                if message.startswith(prefix):
+                    self.after(0, command, self, message[len(prefix):])
+                    break
+            else:
+                if not WU_RE.search(message):
+                    self.logger.warning(f"Unbekannte Listener-Nachricht: {message}")
 
         except Exception as e:
             self.logger.error(f"Fehler beim Verarbeiten der Listener-Nachricht: {e}")
@@ -1140,6 +1176,8 @@ class ProduktManagerApp(ctk.CTk):
             self.logger.error(f"Fehler beim Cleanup: {e}")
         
         finally:
+            # Ausstehende Log-Records schreiben
+            stop_logging(self.log_listener)
             self.destroy()
 
 
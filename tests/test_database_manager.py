@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from database_manager import DatabaseManager
+from exceptions import DatabaseError, ValidationError
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    yield manager
+    manager.close()
+
+
+def test_connection_is_reused_and_uses_wal(db):
+    with db.get_connection() as first:
+        mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+    with db.get_connection() as second:
+        pass
+
+    assert first is second
+    assert mode == "wal"
+
+
+def test_insert_and_lookup_product(db):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567", "Kunde": "ACME"})
+
+    row = db.get_by_wu("WU1234567")
+
+    assert row["Kunde"] == "ACME"
+    assert db.product_exists(1)
+
+
+def test_failed_statement_leaves_no_open_transaction(db):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567"})
+
+    with pytest.raises(DatabaseError):
+        db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU7654321"})
+
+    with db.get_connection() as conn:
+        assert not conn.in_transaction
+    assert db.get_by_wu("WU7654321") is None
+
+
+def test_update_product_reuses_statement_text(db):
+    from database_manager import _build_update_sql
+
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567"})
+    db.update_product(1, {"Kunde": "ACME", "Notizen": "a"})
+    db.update_product(1, {"Kunde": "ACME", "Notizen": "b"})
+
+    assert _build_update_sql.cache_info().hits >= 1
+    assert db.get_by_wu("WU1234567")["Notizen"] == "b"
+
+
+def test_insert_products_accepts_generator(db):
+    rows = (
+        {"Laufende Nummer": i, "Produktnummer": f"WU{i:07d}"} for i in range(1, 6)
+    )
+
+    assert db.insert_products(rows) == 5
+    assert db.product_exists(5)
+
+
+def test_insert_products_is_atomic(db):
+    rows = [
+        {"Laufende Nummer": 1, "Produktnummer": "WU0000001"},
+        {"Laufende Nummer": 2, "Produktnummer": "WU0000002", "Kunde": "ACME"},
+        {"Laufende Nummer": 1, "Produktnummer": "WU0000003"},
+    ]
+
+    with pytest.raises(DatabaseError):
+        db.insert_products(rows)
+
+    assert not db.product_exists(1)
+    assert not db.product_exists(2)
+
+
+def test_lookup_by_produktnummer_uses_index(db):
+    with db.get_connection() as conn:
+        plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM produkte WHERE "Produktnummer"=?',
+            ("WU1234567",),
+        ).fetchall()
+
+    assert any("idx_produkte_produktnummer" in row[-1] for row in plan)
+
+
+def test_lookup_cache_is_invalidated_on_change(db):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567", "Kunde": "ACME"})
+    assert db.get_by_wu("WU1234567")["Kunde"] == "ACME"
+
+    # Rückgabewert ist eine Kopie
+    db.get_by_wu("WU1234567")["Kunde"] = "geändert"
+    assert db.get_by_wu("WU1234567")["Kunde"] == "ACME"
+
+    db.update_product(1, {"Kunde": "Neu"})
+    assert db.get_by_wu("WU1234567")["Kunde"] == "Neu"
+
+    db.delete_product(1)
+    assert db.get_by_wu("WU1234567") is None
+
+
+def test_save_position_only_fills_empty_field(db):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567", "PosPCB_0": " "})
+
+    assert db.save_position(1, "PosPCB_0", "1,2,3")
+    assert not db.save_position(1, "PosPCB_0", "4,5,6")
+    assert db.get_by_wu("WU1234567")["PosPCB_0"] == "1,2,3"
+
+
+def test_save_position_accepts_pcb_and_af_fields(db):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567"})
+
+    assert db.save_position(1, "PCB_0 Top", "1.5")
+    assert db.save_position(1, "AF Breite", "120")
+    row = db.get_by_wu("WU1234567")
+    assert (row["PCB_0 Top"], row["AF Breite"]) == ("1.5", "120")
+
+
+def test_save_position_for_missing_product_returns_true(db):
+    assert db.save_position(2, "PosPCB_0", "1,2,3")
+    assert not db.product_exists(2)
+
+
+@pytest.mark.parametrize("field", ["Kunde", 'Kunde"="x'])
+def test_save_position_rejects_unknown_field(db, field):
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567", "Kunde": "ACME"})
+
+    with pytest.raises(ValidationError):
+        db.save_position(1, field, "1,2,3")
+    assert db.get_by_wu("WU1234567")["Kunde"] == "ACME"
+
+
+def test_lookup_returns_fields_in_reply_order(db):
+    from config import Config
+
+    db.insert_product({"Laufende Nummer": 1, "Produktnummer": "WU1234567", "AF Ursprung": "1,2,3"})
+
+    row = db.get_by_wu("WU1234567")
+    assert tuple(row) == Config.ALL_FIELDS + ("AF Ursprung",)
+    assert row["AF Ursprung"] == "1,2,3"
@@ -2,33 +2,46 @@ import socket
 import threading
 import time
 import sys
+from concurrent.futures import Future
 from pathlib import Path
 
 import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
-from communication_manager import LimaClient
+from communication_manager import CobotCommunicator, LimaClient, RobotCommunicator, is_json_object
+from exceptions import CommunicationError
 
 
-def _start_server(response: str):
-    port_holder = []
-
-    def server():
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind(("127.0.0.1", 0))
-            s.listen(1)
-            port_holder.append(s.getsockname()[1])
-            conn, _ = s.accept()
-            with conn:
-                conn.recv(1024)
-                conn.sendall(response.encode("utf-8"))
-
-    thread = threading.Thread(target=server, daemon=True)
+def _serve(*handlers):
+    """Startet einen TCP-Server, der je Verbindung der Reihe nach einen Handler aufruft
+
+    Nach der letzten Verbindung werden keine weiteren angenommen. Liefert
+    (Port, Server-Thread).
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(len(handlers))
+
+    def run():
+        with server:
+            for i, handler in enumerate(handlers):
+                conn, _ = server.accept()
+                if i == len(handlers) - 1:
+                    server.close()
+                with conn:
+                    handler(conn)
+
+    thread = threading.Thread(target=run, daemon=True)
     thread.start()
+    return server.getsockname()[1], thread
 
-    while not port_holder:
-        time.sleep(0.01)
-    return port_holder[0], thread
+
+def _start_server(response: str):
+    def reply(conn):
+        conn.recv(1024)
+        conn.sendall(response.encode("utf-8"))
+
+    return _serve(reply)
 
 
 def test_send_command_receives_response():
@@ -39,3 +52,394 @@ def test_send_command_receives_response():
 
     assert result == "<TOk/>"
     thread.join(timeout=1)
+
+
+def test_get_product_info_parses_json_value():
+    port, thread = _start_server(
+        "<LIMA CMD=\"Project_GetNode\" DIR=\"ReplyOk\" VALUE='{\"Kunde\": \"ACME\"}' />\n"
+    )
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+
+    result = client.get_product_info("WU1234567")
+
+    assert result == {"Kunde": "ACME"}
+    thread.join(timeout=1)
+
+
+def test_send_command_reuses_connection():
+    def reply_twice(conn):
+        for _ in range(2):
+            conn.recv(1024)
+            conn.sendall(b"<TOk/>\n")
+
+    # Nur eine Verbindung wird angenommen
+    port, thread = _serve(reply_twice)
+
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+    assert client.send_command("<T/>") == "<TOk/>"
+    assert client.send_command("<T/>") == "<TOk/>"
+    client.close()
+    thread.join(timeout=1)
+
+
+class _StubLimaClient(LimaClient):
+    def __init__(self, responses):
+        super().__init__("127.0.0.1", 0)
+        self.responses = responses
+        self.sent = []
+        self.batches = []
+
+    def send_commands_raw(self, commands):
+        self.sent.extend(commands)
+        self.batches.append(list(commands))
+        return [self.responses.pop(0) for _ in commands]
+
+
+def test_robot_communicator_parses_values():
+    client = _StubLimaClient([
+        b'<LIMA DIR="ReplyOk" VALUE="1.5,2.5,3.5,0,0,0" />',
+        b'<LIMA DIR="ReplyOk" VALUE="12.0" />',
+    ])
+    robot = RobotCommunicator(client)
+
+    assert robot.get_current_position() == (1.5, 2.5, 3.5)
+    assert robot.get_af_value("AF Breite") == "12.0"
+
+
+def test_get_af_value_rejects_unknown_field():
+    client = _StubLimaClient([])
+    robot = RobotCommunicator(client)
+
+    with pytest.raises(ValueError):
+        robot.get_af_value("AF Unbekannt")
+    assert client.sent == []
+
+
+def test_split_responses_pipelined():
+    data = (
+        b'<LIMA DIR="ReplyOk" VALUE="1" /><LIMA DIR="ReplyOk">text</LIMA>\n'
+        b'<TOk/>\n<LIMA VALUE="a>b"'
+    )
+    responses, rest = LimaClient._split_responses(data)
+    assert responses == [
+        b'<LIMA DIR="ReplyOk" VALUE="1" />',
+        b'<LIMA DIR="ReplyOk">text</LIMA>',
+        b"<TOk/>",
+    ]
+    assert rest == b'<LIMA VALUE="a>b"'
+
+
+def test_batch_query_uses_single_request():
+    client = _StubLimaClient([
+        b'<LIMA DIR="ReplyOk" VALUE="4.2" />',
+        b'<LIMA DIR="ReplyError" INFO="x" />',
+    ])
+    robot = RobotCommunicator(client)
+
+    result = robot.batch_query("get_focus", "get_tcp_pose")
+
+    assert result == {"get_focus": "4.2", "get_tcp_pose": None}
+    assert len(client.sent) == 2
+
+
+def test_get_af_origin_xyz_uses_one_batch():
+    client = _StubLimaClient([
+        b'<LIMA DIR="ReplyOk" VALUE="1.0" />',
+        b'<LIMA DIR="ReplyOk" VALUE="2.0" />',
+        b'<LIMA DIR="ReplyOk" VALUE="3.0" />',
+    ])
+    robot = RobotCommunicator(client)
+
+    assert robot.get_af_origin_xyz() == (1.0, 2.0, 3.0)
+    assert len(client.batches) == 1
+    assert len(client.batches[0]) == 3
+
+
+def test_get_af_origin_xyz_accepts_zero_and_rejects_missing():
+    client = _StubLimaClient([
+        b'<LIMA DIR="ReplyOk" VALUE="0" />',
+        b'<LIMA DIR="ReplyOk" VALUE="0.0" />',
+        b'<LIMA DIR="ReplyOk" VALUE="-1.5" />',
+        b'<LIMA DIR="ReplyOk" VALUE="1.0" />',
+        b'<LIMA DIR="ReplyError" INFO="x" />',
+        b'<LIMA DIR="ReplyOk" VALUE="3.0" />',
+    ])
+    robot = RobotCommunicator(client)
+
+    assert robot.get_af_origin_xyz() == (0.0, 0.0, -1.5)
+    assert robot.get_af_origin_xyz() is None
+
+
+def test_missing_reply_is_resent_and_late_reply_dropped():
+    def reply_late(conn):
+        conn.recv(1024)
+        conn.sendall(b"<A/>\n")
+        time.sleep(0.3)
+        try:
+            conn.sendall(b"<B/>\n")  # verspätete Antwort
+        except OSError:
+            pass
+
+    def reply(conn):
+        conn.recv(1024)
+        conn.sendall(b"<C/>\n")
+
+    port, thread = _serve(reply_late, reply)
+
+    client = LimaClient("127.0.0.1", port, timeout=0.2)
+    # Das zweite Kommando wird über eine neue Verbindung erneut gesendet
+    assert client.send_commands_raw(["<Q/>", "<Q/>"]) == [b"<A/>", b"<C/>"]
+    client.close()
+    thread.join(timeout=1)
+
+
+def _answer_once(value: str):
+    """Handler einer Gegenstelle, die nur das erste Kommando je Verbindung beantwortet"""
+    def handler(conn):
+        conn.recv(1024)
+        conn.sendall(f'<LIMA DIR="ReplyOk" VALUE="{value}" />\n'.encode("utf-8"))
+
+    return handler
+
+
+def test_peer_answering_once_per_connection_serves_all_callers():
+    port, thread = _serve(*[_answer_once("1.5")] * 6)
+    robot = RobotCommunicator(LimaClient("127.0.0.1", port, timeout=1.0))
+    results = []
+
+    workers = [
+        threading.Thread(target=lambda: results.append(robot.get_focus_value()))
+        for _ in range(6)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=5)
+    robot.lima_client.close()
+    thread.join(timeout=1)
+
+    assert results == ["1.5"] * 6
+
+
+def test_surplus_replies_stay_buffered():
+    client = LimaClient("127.0.0.1", 0, timeout=0.2)
+    local, remote = socket.socketpair()
+    with local, remote:
+        local.settimeout(0.2)
+        remote.sendall(b"<A/>\n<B/>\n")
+
+        assert client._receive_responses(local, 1) == [b"<A/>"]
+        assert client._receive_responses(local, 1) == [b"<B/>"]
+
+
+def test_send_command_wraps_invalid_utf8_reply():
+    client = _StubLimaClient([b"<LIMA VALUE=\"\xff\" />"])
+
+    with pytest.raises(CommunicationError):
+        client.send_command("<Q/>")
+
+
+def test_get_focus_value_uses_udp_when_configured():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+        server.bind(("127.0.0.1", 0))
+        udp_port = server.getsockname()[1]
+
+        def serve():
+            data, addr = server.recvfrom(1500)
+            server.sendto(b'<LIMA DIR="ReplyOk" VALUE="7.5" />\n', addr)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+
+        client = LimaClient("127.0.0.1", 1, timeout=1.0, udp_port=udp_port)
+        assert RobotCommunicator(client).get_focus_value() == "7.5"
+        client.close()
+        thread.join(timeout=1)
+
+
+def test_concurrent_commands_get_matching_replies():
+    def echo(conn):
+        buffer = b""
+        answered = 0
+        while answered < 8:
+            data = conn.recv(1024)
+            if not data:
+                break
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                conn.sendall(line.replace(b"<Q", b"<A") + b"\n")
+                answered += 1
+
+    port, thread = _serve(echo)
+
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+    results = {}
+
+    def worker(i):
+        results[i] = client.send_command(f'<Q N="{i}"/>')
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=2)
+    client.close()
+    thread.join(timeout=1)
+
+    assert results == {i: f'<A N="{i}"/>' for i in range(8)}
+
+
+def test_test_connection_reports_reachability():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        s.listen(1)
+        port = s.getsockname()[1]
+        assert LimaClient("127.0.0.1", port, timeout=1.0).test_connection()
+
+    # Port ist nach dem Schließen nicht mehr erreichbar
+    assert not LimaClient("127.0.0.1", port, timeout=1.0).test_connection()
+
+
+def test_parse_lima_response_fast_path_matches_elementtree():
+    client = LimaClient("127.0.0.1", 0)
+
+    assert client.parse_lima_response(
+        b'<LIMA CMD="Project_GetNode" DIR="ReplyOk" VALUE=\'{"a": "b>c"}\' />'
+    ) == {"CMD": "Project_GetNode", "DIR": "ReplyOk", "VALUE": '{"a": "b>c"}'}
+    assert client.parse_lima_response('<LIMA DIR="ReplyOk"> text </LIMA>') == {
+        "DIR": "ReplyOk",
+        "TEXT": "text",
+    }
+    # Entities laufen über den ElementTree-Fallback
+    assert client.parse_lima_response('<LIMA VALUE="a &amp; b" />') == {"VALUE": "a & b"}
+    assert client.parse_lima_response("kein xml") == {}
+
+
+def test_send_command_reads_reply_larger_than_buffer():
+    value = "x" * 40000
+    reply = f'<LIMA DIR="ReplyOk" VALUE="{value}" />\n'.encode("utf-8")
+
+    def reply_in_chunks(conn):
+        conn.recv(1024)
+        for i in range(0, len(reply), 5000):
+            conn.sendall(reply[i:i + 5000])
+            time.sleep(0.001)
+
+    port, thread = _serve(reply_in_chunks)
+
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+    result = client.send_command_raw("<Q/>")
+    client.close()
+    thread.join(timeout=1)
+
+    assert result == reply.strip()
+
+
+def test_test_connection_uses_open_persistent_connection():
+    served = threading.Event()
+
+    def reply(conn):
+        conn.recv(1024)
+        conn.sendall(b"<TOk/>\n")
+        served.wait(timeout=2)
+
+    # Nach dieser Verbindung nimmt der Server keine weiteren an
+    port, thread = _serve(reply)
+
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+    assert client.send_command("<T/>") == "<TOk/>"
+    assert client.test_connection()
+    served.set()
+    client.close()
+    thread.join(timeout=1)
+
+
+def test_close_fails_queued_commands():
+    client = LimaClient("127.0.0.1", 0, timeout=0.5)
+    future = Future()
+    client._queue.put((["<Q/>"], future))
+
+    client.close()
+
+    with pytest.raises(CommunicationError):
+        future.result(timeout=0)
+    assert client._io_thread is None
+
+
+def test_test_connection_detects_peer_close():
+    closed = threading.Event()
+
+    def reply_and_close(conn):
+        conn.recv(1024)
+        conn.sendall(b"<TOk/>\n")
+        conn.close()
+        closed.set()
+
+    port, thread = _serve(reply_and_close)
+
+    client = LimaClient("127.0.0.1", port, timeout=1.0)
+    assert client.send_command("<T/>") == "<TOk/>"
+    closed.wait(timeout=2)
+    time.sleep(0.05)
+
+    assert client._sock is not None
+    assert not client.test_connection()
+    client.close()
+    thread.join(timeout=1)
+
+
+def test_udp_query_ignores_replies_from_other_senders():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server, \
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as stranger:
+        server.bind(("127.0.0.1", 0))
+        udp_port = server.getsockname()[1]
+
+        def serve():
+            data, addr = server.recvfrom(1500)
+            stranger.sendto(b'<LIMA DIR="ReplyOk" VALUE="fremd" />\n', addr)
+            time.sleep(0.05)
+            server.sendto(b'<LIMA DIR="ReplyOk" VALUE="7.5" />\n', addr)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+
+        client = LimaClient("127.0.0.1", 1, timeout=1.0, udp_port=udp_port)
+        assert client.send_query_udp("<Q/>") == b'<LIMA DIR="ReplyOk" VALUE="7.5" />'
+        thread.join(timeout=1)
+
+
+def test_cobot_udp_status_ignores_replies_from_other_senders():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server, \
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as stranger:
+        server.bind(("127.0.0.1", 0))
+        udp_port = server.getsockname()[1]
+
+        def serve():
+            data, addr = server.recvfrom(1500)
+            stranger.sendto(b"STATUS:fremd", addr)
+            time.sleep(0.05)
+            server.sendto(b"STATUS:RUNNING", addr)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+
+        cobot = CobotCommunicator("127.0.0.1", 1, timeout=1.0, udp_port=udp_port)
+        assert cobot.get_cobot_status() == "RUNNING"
+        thread.join(timeout=1)
+
+
+def test_is_json_object_accepts_only_objects():
+    assert is_json_object({"Kunde": "ACME"})
+    assert not is_json_object(["ACME"])
+    assert not is_json_object("ACME")
+    assert not is_json_object(None)
+
+
+def test_get_af_origin_xyz_with_peer_answering_once_per_connection():
+    port, thread = _serve(*[_answer_once("1.5")] * 3)
+    robot = RobotCommunicator(LimaClient("127.0.0.1", port, timeout=1.0))
+
+    assert robot.get_af_origin_xyz() == (1.5, 1.5, 1.5)
+    robot.lima_client.close()
+    thread.join(timeout=1)
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from communication_manager import ListenerMode
@@ -26,3 +28,90 @@ def test_split_messages_mixed_terminators():
     messages, remaining = ListenerMode._split_messages(buffer)
     assert messages == ["a", "b", "c"]
     assert remaining == "d"
+
+
+def test_listener_acknowledges_message_and_stops_quickly():
+    import socket
+    import time
+
+    received = []
+    listener = ListenerMode("127.0.0.1", 1)
+    listener.listen_port = 0  # freien Port wählen
+    assert listener.start(lambda msg, ip: received.append((msg, ip)))
+    port = listener.server_socket.getsockname()[1]
+
+    with socket.create_connection(("127.0.0.1", port), timeout=2) as sock:
+        sock.sendall(b"WU123\n")
+        assert sock.recv(1024) == b"MESSAGE_RECEIVED"
+
+    start = time.monotonic()
+    listener.stop()
+    assert time.monotonic() - start < 0.5
+    assert received == [("WU123", "127.0.0.1")]
+
+
+def test_listener_handles_unterminated_message_immediately():
+    import socket
+    import time
+
+    received = []
+    listener = ListenerMode("127.0.0.1", 1)
+    listener.listen_port = 0
+    assert listener.start(lambda msg, ip: received.append(msg))
+    port = listener.server_socket.getsockname()[1]
+
+    try:
+        for payload in (b"WU1234567", b"WU7654321\r"):
+            start = time.monotonic()
+            with socket.create_connection(("127.0.0.1", port), timeout=2) as sock:
+                sock.sendall(payload)
+                assert sock.recv(1024) == b"MESSAGE_RECEIVED"
+            assert time.monotonic() - start < 0.5
+    finally:
+        listener.stop()
+    assert received == ["WU1234567", "WU7654321"]
+
+
+def test_split_message_bytes_consumes_complete_messages():
+    pending = bytearray(b"a\nb\rcENDdEN")
+    assert ListenerMode._split_message_bytes(pending) == ["a", "b", "c"]
+    assert pending == bytearray(b"dEN")
+    pending += b"D"
+    assert ListenerMode._split_message_bytes(pending) == ["d"]
+    assert pending == bytearray()
+
+
+def test_message_log_keeps_last_100_events():
+    listener = ListenerMode("127.0.0.1", 1)
+    for i in range(150):
+        listener._log_event("MESSAGE_RECEIVED", str(i), "127.0.0.1")
+
+    log = listener.get_message_log()
+    assert isinstance(log, list)
+    assert len(log) == 100
+    assert log[0]["message"] == "50"
+    assert log[-1]["message"] == "149"
+    assert re.fullmatch(r"\d{2}:\d{2}:\d{2}\.\d{3}", log[-1]["timestamp"])
+    assert listener.message_count == 150
+
+    listener.clear_message_log()
+    assert listener.message_count == 0
+
+
+def test_log_callback_runs_on_dispatch_thread():
+    import threading
+
+    events = []
+    listener = ListenerMode("127.0.0.1", 1)
+    listener.listen_port = 0
+    assert listener.start(
+        lambda msg, ip: None,
+        lambda event: events.append((event["type"], threading.current_thread().name)),
+    )
+    listener._log_event("MESSAGE_RECEIVED", "WU1", "127.0.0.1")
+    listener.stop()
+
+    types = [event_type for event_type, _ in events]
+    assert types[:2] == ["LISTENER_STARTED", "MESSAGE_RECEIVED"]
+    assert types[-1] == "LISTENER_STOPPED"
+    assert events[1][1] == "ListenerLog"
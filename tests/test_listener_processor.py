@@ -19,6 +19,32 @@ def test_format_row_with_codes():
     assert result == "LaufendeNummer:1_ProduktNr:WU123_Kunde:ACME"
 
 
+def test_format_row_missing_fields_are_empty():
+    row = {"Produktnummer": "WU123"}
+    fields = ["Laufende Nummer", "Produktnummer"]
+    assert _format_row_as_underscore_string(row, fields) == "LaufendeNummer:_ProduktNr:WU123"
+    assert _format_row_as_underscore_string(row, ["Produktnummer"]) == "ProduktNr:WU123"
+
+
+def test_format_row_with_quotes_in_field_names():
+    row = {"A'1": "x", 'B"2': None, "C\\3": 0}
+    fields = ["A'1", 'B"2', "C\\3"]
+    assert _format_row_as_underscore_string(row, fields) == "A1:x_B2:None_C3:0"
+
+
+def test_format_row_replaces_underscores_in_free_text_values():
+    row = {"Produktnummer": "WU1", "Notizen": "a_b_c", "Kunde": "A_B"}
+    fields = ["Produktnummer", "Notizen", "Kunde"]
+    assert _format_row_as_underscore_string(row, fields) == "ProduktNr:WU1_Notizen:a-b-c_Kunde:A-B"
+    assert _format_row_as_underscore_string({"Notizen": "x_y"}, fields) == "ProduktNr:_Notizen:x-y_Kunde:"
+
+
+def test_format_row_keeps_other_values_unchanged():
+    row = {"Produktnummer": "WU_1", "PosPCB_0": "1_2", "Kunde": "A_B"}
+    fields = ["Produktnummer", "PosPCB_0", "Kunde"]
+    assert _format_row_as_underscore_string(row, fields) == "ProduktNr:WU_1_POSPCB0:1_2_Kunde:A-B"
+
+
 def test_format_row_none():
     assert _format_row_as_underscore_string(None) == ""
 
@@ -47,6 +73,21 @@ def test_extract_wu_with_trailing_letters():
     assert _extract_wu(payload) == "WU0000003CU"
 
 
+def test_extract_wu_without_marker():
+    from listener_processor import _extract_wu
+
+    assert _extract_wu("TRIGGER:1") is None
+    assert _extract_wu("AWU123") is None
+    assert _extract_wu("") is None
+
+
+def test_extract_wu_mixed_case_marker():
+    from listener_processor import _extract_wu
+
+    assert _extract_wu("foo Wu-123 bar") == "Wu-123"
+    assert _extract_wu("foo wU123 bar") == "wU123"
+
+
 def test_handle_listener_payload_appends_end(monkeypatch):
     class DummyDB:
         def get_by_wu(self, wu):
@@ -73,3 +114,94 @@ def test_handle_listener_payload_appends_end(monkeypatch):
 
     assert sent["msg"].endswith("END")
     assert log_messages[0].endswith("END")
+
+
+def test_handle_listener_payload_unknown_wu(monkeypatch):
+    class DummyDB:
+        def get_by_wu(self, wu):
+            return None
+
+    sent: list = []
+    monkeypatch.setattr(
+        listener_processor, "_send_to_cobot", lambda ip, port, message, **kwargs: sent.append(message) or True
+    )
+
+    listener_processor.handle_listener_payload(
+        "WU123", DummyDB(), "127.0.0.1", 1234, logging.getLogger("test")
+    )
+
+    assert sent == ["NichtVorhandenEND"]
+
+
+def test_send_to_cobot_reuses_connection():
+    import socket
+    import threading
+    import time
+
+    accepted = []
+    received = []
+    port_holder = []
+
+    def server():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            s.listen(1)
+            port_holder.append(s.getsockname()[1])
+            conn, _ = s.accept()
+            accepted.append(conn)
+            with conn:
+                for _ in range(2):
+                    received.append(conn.recv(1024))
+                    conn.sendall(b"OK\n")
+
+    thread = threading.Thread(target=server, daemon=True)
+    thread.start()
+    while not port_holder:
+        time.sleep(0.01)
+
+    assert listener_processor._send_to_cobot("127.0.0.1", port_holder[0], "AEND")
+    assert listener_processor._send_to_cobot("127.0.0.1", port_holder[0], "BEND")
+    listener_processor._get_sender("127.0.0.1", port_holder[0], 5.0).close()
+    thread.join(timeout=1)
+
+    assert len(accepted) == 1
+    assert received == [b"AEND\n", b"BEND\n"]
+
+
+def test_send_without_ok_does_not_leave_ack_for_next_message():
+    import socket
+    import threading
+    import time
+
+    received = []
+    port_holder = []
+
+    def server():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            s.listen(2)
+            port_holder.append(s.getsockname()[1])
+            # Die Nachricht ohne OK-Abfrage wird quittiert, die zweite nicht
+            conn, _ = s.accept()
+            with conn:
+                received.append(conn.recv(1024))
+                conn.sendall(b"OK\n")
+            conn, _ = s.accept()
+            with conn:
+                received.append(conn.recv(1024))
+                conn.recv(1024)
+
+    thread = threading.Thread(target=server, daemon=True)
+    thread.start()
+    while not port_holder:
+        time.sleep(0.01)
+
+    try:
+        assert listener_processor._send_to_cobot("127.0.0.1", port_holder[0], "AEND", read_ok=False, timeout=0.5)
+        assert not listener_processor._send_to_cobot("127.0.0.1", port_holder[0], "BEND", timeout=0.5)
+    finally:
+        listener_processor.close_cobot_senders()
+    thread.join(timeout=1)
+
+    assert received == [b"AEND\n", b"BEND\n"]
+    assert not listener_processor._senders
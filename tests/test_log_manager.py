@@ -0,0 +1,37 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import Config
+from log_manager import setup_logging, stop_logging
+
+
+@pytest.fixture
+def root_logger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_records_reach_log_file_after_stop(tmp_path, root_logger):
+    # Vorhandene Root-Handler (etwa aus basicConfig beim Import) werden ersetzt
+    root_logger.addHandler(logging.NullHandler())
+    listener = setup_logging()
+    assert len(root_logger.handlers) == 1
+
+    logger = logging.getLogger("test_log_manager")
+    logger.info("gepufferte Info")
+    logger.warning("sofortige Warnung")
+    stop_logging(listener)
+
+    content = (tmp_path / "logs" / Config.LOG_FILE).read_text()
+    assert "INFO - gepufferte Info" in content
+    assert "WARNING - sofortige Warnung" in content
+    assert all(handler.stream is None for handler in listener.handlers
+               if isinstance(handler, logging.FileHandler))
@@ -42,12 +42,12 @@ class ThreadManager:
         """Wrapper für Thread-Funktionen mit Exception-Handling"""
         thread_name = threading.current_thread().name
         try:
-            logger.debug(f"Thread {thread_name} gestartet")
+            logger.debug("Thread %s gestartet", thread_name)
             target(*args, **kwargs)
         except Exception as e:
             logger.error(f"Fehler in Thread {thread_name}: {e}", exc_info=True)
         finally:
-            logger.debug(f"Thread {thread_name} beendet")
+            logger.debug("Thread %s beendet", thread_name)
     
     def stop_all_threads(self, timeout: float = 2.0) -> None:
         """Stoppt alle verwalteten Threads"""
@@ -65,7 +65,7 @@ class ThreadManager:
                     if thread.is_alive():
                         logger.warning(f"Thread {thread.name} konnte nicht gestoppt werden")
                     else:
-                        logger.debug(f"Thread {thread.name} erfolgreich gestoppt")
+                        logger.debug("Thread %s erfolgreich gestoppt", thread.name)
             
             # Liste der Threads bereinigen
             self.threads = [t for t in self.threads if t.is_alive()]
@@ -87,7 +87,7 @@ class ThreadManager:
             after_count = len(self.threads)
             
             if before_count != after_count:
-                logger.debug(f"{before_count - after_count} beendete Threads bereinigt")
+                logger.debug("%d beendete Threads bereinigt", before_count - after_count)
     
     @contextmanager
     def managed_thread(self, 
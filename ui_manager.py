@@ -4,7 +4,7 @@ UI-Management für den THT-Produktmanager
 import customtkinter as ctk
 import tkinter.messagebox as mbox
 import logging
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Sequence
 from datetime import datetime
 from config import Config
 from validation import Validator
@@ -36,7 +36,7 @@ class BaseUIComponent:
 class FormManager(BaseUIComponent):
     """Verwaltet Formulareingaben"""
     
-    def __init__(self, parent, fields: List[str]):
+    def __init__(self, parent, fields: Sequence[str]):
         super().__init__(parent)
         self.fields = fields
         self.form_data = {}
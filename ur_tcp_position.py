@@ -41,7 +41,7 @@ def decode_robot_data(raw_data: bytes) -> Optional[str]:
 
 def receive_tcp_data(sock: socket.socket) -> Optional[str]:
     """Receives and decodes robot data robustly"""
-    raw_data = b""
+    raw_data = bytearray()
     start_time = time.time()
 
     while time.time() - start_time < 3.0:
@@ -52,9 +52,12 @@ def receive_tcp_data(sock: socket.socket) -> Optional[str]:
                 break
             raw_data += chunk
 
-            decoded = decode_robot_data(raw_data)
-            if decoded and '[' in decoded and ']' in decoded:
-                return decoded
+            # Klammern sind in allen unterstützten Encodings ASCII -> erst
+            # dekodieren, wenn die Antwort vollständig sein kann
+            if (b'[' in chunk or b']' in chunk) and b'[' in raw_data and b']' in raw_data:
+                decoded = decode_robot_data(bytes(raw_data))
+                if decoded:
+                    return decoded
         except socket.timeout:
             continue
         except Exception as exc:
@@ -137,7 +140,7 @@ def get_tcp_position(ip: str, ports: List[int] = [30002, 30003, 30001], retries:
             continue
         try:
             cmd = "get_actual_tcp_pose()\n"
-            sock.send(cmd.encode('utf-8'))
+            sock.sendall(cmd.encode('utf-8'))
             response = receive_tcp_data(sock)
             debug_print(f"Empfangen: {response[:100] if response else 'None'}")
             if not response:
@@ -8,6 +8,11 @@ from typing import Any, Optional
 from exceptions import ValidationError
 from config import Config
 
+# Einmalig beim Import aufgebaut statt pro Aufruf
+_AF_FIELDS = frozenset(Config.AF_FIELDS)
+_PRODUKTNUMMER_RE = re.compile(r'^WU\d{7,}$')
+_WU_NUMMER_RE = re.compile(r'WU\d{7,}')
+
 class Validator:
     """Zentrale Validierungsklasse"""
     
@@ -42,8 +47,7 @@ class Validator:
         if not nummer:
             return False
         # Beispiel-Pattern: WU1234567
-        pattern = r'^WU\d{7,}$'
-        return bool(re.match(pattern, nummer))
+        return bool(_PRODUKTNUMMER_RE.match(nummer))
     
     @staticmethod
     def validate_required_field(value: str, field_name: str) -> None:
@@ -59,10 +63,15 @@ class Validator:
         except ValueError:
             raise ValidationError(f"Feld '{field_name}' muss eine Zahl sein")
 
+    @staticmethod
+    def known_af_fields() -> tuple:
+        """Liefert alle zulässigen AF-Feldnamen"""
+        return tuple(Config.AF_FIELDS)
+
     @staticmethod
     def validate_af_field(field: str) -> bool:
         """Validiert, ob ein AF-Feld zulässig ist"""
-        return isinstance(field, str) and field in Config.AF_FIELDS
+        return isinstance(field, str) and field in _AF_FIELDS
     
     @staticmethod
     def validate_password(password: str, expected: str) -> bool:
@@ -94,11 +103,15 @@ class Validator:
         for port_key in ['port', 'listener_port', 'send_port']:
             if not cls.validate_port(config[port_key]):
                 raise ValidationError(f"Ungültiger Port: {port_key}")
+        
+        # Optionaler UDP-Port für Abfragen
+        if config.get('udp_port') and not cls.validate_port(config['udp_port']):
+            raise ValidationError("Ungültiger Port: udp_port")
     
     @staticmethod
     def extract_wu_nummer(text: str) -> Optional[str]:
         """Extrahiert WU-Nummer aus Text"""
         if not text:
             return None
-        match = re.search(r'WU\d{7,}', text)
+        match = _WU_NUMMER_RE.search(text)
         return match.group(0) if match else None